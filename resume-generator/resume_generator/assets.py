@@ -0,0 +1,202 @@
+"""Post-render asset stage for the portfolio: minify, fingerprint, precompress.
+
+The minifiers are deliberately conservative (stdlib only, no JS parsing): comments
+and indentation go, whitespace runs collapse, and nothing that could change what
+the browser executes or renders is rewritten. Inline ``<style>`` blocks carry no
+template expressions, so they are moved into ``assets/style.<hash>.css``, which can
+be cached forever - the ``_headers`` file says so to hosts that honour it
+(Netlify, Cloudflare Pages). Every text asset gets ``.gz`` and, when the optional
+``brotli`` package is installed, ``.br`` siblings for servers that serve them as-is.
+Siblings whose source is gone are deleted, and :func:`remove_optimized` deletes every
+file of the stage when it is turned off, so a server never serves a stale sibling.
+"""
+
+import gzip
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import NamedTuple
+
+from .outputs import write_if_changed, write_text_if_changed
+
+ASSETS_DIR = "assets"
+HEADERS_FILE = "_headers"
+SIBLING_SUFFIXES = (".gz", ".br")
+COMPRESSIBLE = {".html", ".css", ".js", ".json", ".xml", ".svg", ".txt"}
+HEADERS = """\
+/assets/*
+  Cache-Control: public, max-age=31536000, immutable
+/data.*.js
+  Cache-Control: public, max-age=31536000, immutable
+/*.html
+  Cache-Control: public, max-age=0, must-revalidate
+/
+  Cache-Control: public, max-age=0, must-revalidate
+"""
+
+_CSS_TOKENS = re.compile(
+    r"""(?P<string>"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')"""
+    r"|(?P<comment>/\*.*?\*/)"
+    r"|\s*;?\s*(?P<close>\})\s*"
+    r"|\s*(?P<punct>[{;,>])\s*"
+    r"|(?P<colon>:)\s+"
+    r"|(?P<space>\s+)",
+    re.DOTALL,
+)
+# Elements whose content is not HTML markup; <pre>/<textarea> keep their whitespace
+_RAW_BLOCKS = re.compile(r"(<(script|style|pre|textarea)\b[^>]*>)(.*?)(</\2\s*>)", re.DOTALL | re.IGNORECASE)
+_HTML_COMMENT = re.compile(r"<!--(?!\[if).*?-->", re.DOTALL)
+_STYLE_BLOCK = re.compile(r"<style>(.*?)</style>", re.DOTALL | re.IGNORECASE)
+
+
+class AssetSize(NamedTuple):
+    path: Path
+    raw: int
+    gzip: int
+    brotli: int | None
+
+
+def _css_token(match: re.Match) -> str:
+    kind = match.lastgroup
+    if kind in {"string", "close", "punct", "colon"}:
+        return match.group(kind)
+    return "" if kind == "comment" else " "
+
+
+def minify_css(css: str) -> str:
+    return _CSS_TOKENS.sub(_css_token, css).strip()
+
+
+def minify_js(js: str) -> str:
+    """Drop indentation, blank lines and whole-line ``//`` comments; line breaks stay for ASI."""
+    lines = (line.strip() for line in js.splitlines())
+    return "\n".join(line for line in lines if line and not line.startswith("//"))
+
+
+def _minify_raw_block(match: re.Match) -> str:
+    open_tag, name, body, close_tag = match.groups()
+    name = name.lower()
+    if name == "style":
+        body = minify_css(body)
+    elif name == "script" and "application/ld+json" in open_tag:
+        try:
+            body = json.dumps(json.loads(body), ensure_ascii=False, separators=(",", ":"))
+        except json.JSONDecodeError:
+            body = minify_js(body)
+    elif name == "script":
+        body = minify_js(body)
+    return f"{open_tag}{body}{close_tag}"
+
+
+def minify_html(html: str) -> str:
+    """Remove comments and collapse whitespace in markup; minify inline CSS and JS."""
+    parts = []
+    position = 0
+    for match in _RAW_BLOCKS.finditer(html):
+        parts.extend((_minify_markup(html[position : match.start()]), _minify_raw_block(match)))
+        position = match.end()
+    parts.append(_minify_markup(html[position:]))
+    return "".join(parts).strip() + "\n"
+
+
+def _minify_markup(markup: str) -> str:
+    return re.sub(r"\s+", " ", _HTML_COMMENT.sub("", markup))
+
+
+def extract_css(html: str, output_dir: Path) -> tuple[str, Path | None]:
+    """Move every attribute-less ``<style>`` block into one content-hashed stylesheet."""
+    blocks = _STYLE_BLOCK.findall(html)
+    if not blocks:
+        return html, None
+
+    css = minify_css("\n".join(blocks)).encode("utf-8")
+    assets_dir = output_dir / ASSETS_DIR
+    assets_dir.mkdir(parents=True, exist_ok=True)
+    stylesheet = assets_dir / f"style.{hashlib.sha256(css).hexdigest()[:12]}.css"
+    write_if_changed(stylesheet, css)
+    for stale in assets_dir.glob("style.*.css*"):
+        if not stale.name.startswith(stylesheet.name):
+            stale.unlink()
+
+    link = f'<link rel="stylesheet" href="{ASSETS_DIR}/{stylesheet.name}">'
+    html = _STYLE_BLOCK.sub("", html)
+    html = html.replace("</head>", f"{link}</head>", 1)
+    write_text_if_changed(output_dir / HEADERS_FILE, HEADERS)
+    return html, stylesheet
+
+
+def optimize_page(html: str, output_dir: Path, *, extract: bool = True) -> str:
+    """Minified page, with its inline CSS moved to a fingerprinted file when ``extract`` is set."""
+    html = minify_html(html)
+    if extract:
+        html, _ = extract_css(html, output_dir)
+    return html
+
+
+def _brotli():
+    try:
+        import brotli  # noqa: PLC0415 - optional dependency
+    except ImportError:
+        return None
+    return brotli
+
+
+def _siblings(output_dir: Path) -> list[Path]:
+    """Precompressed siblings under ``output_dir``: ``<name><compressible suffix>.gz`` or ``.br``."""
+    return [
+        path
+        for path in sorted(output_dir.rglob("*"))
+        if path.suffix in SIBLING_SUFFIXES and path.with_suffix("").suffix in COMPRESSIBLE and path.is_file()
+    ]
+
+
+def remove_optimized(output_dir: Path) -> list[Path]:
+    """Delete the stage's output (siblings, fingerprinted stylesheets, ``_headers``); returns the deleted files."""
+    assets_dir = output_dir / ASSETS_DIR
+    stylesheets = re.compile(r"style\.[0-9a-f]{12}\.css(\.gz|\.br)?")
+    removed = _siblings(output_dir)
+    removed.extend(path for path in sorted(assets_dir.glob("style.*")) if stylesheets.fullmatch(path.name))
+    if (output_dir / HEADERS_FILE).is_file():
+        removed.append(output_dir / HEADERS_FILE)
+    for path in dict.fromkeys(removed):
+        path.unlink(missing_ok=True)
+    if assets_dir.is_dir() and not any(assets_dir.iterdir()):
+        assets_dir.rmdir()
+    return removed
+
+
+def precompress(output_dir: Path) -> list[AssetSize]:
+    """Write ``.gz`` (and ``.br``) siblings for every text asset under ``output_dir``; delete orphaned ones."""
+    brotli = _brotli()
+    for sibling in _siblings(output_dir):
+        if not sibling.with_suffix("").is_file() or (sibling.suffix == ".br" and not brotli):
+            sibling.unlink()
+    sizes = []
+    for path in sorted(output_dir.rglob("*")):
+        if not path.is_file() or path.suffix not in COMPRESSIBLE:
+            continue
+        data = path.read_bytes()
+        gzipped = gzip.compress(data, compresslevel=9, mtime=0)
+        write_if_changed(path.with_name(path.name + ".gz"), gzipped)
+        brotli_size = None
+        if brotli:
+            compressed = brotli.compress(data, quality=11)
+            write_if_changed(path.with_name(path.name + ".br"), compressed)
+            brotli_size = len(compressed)
+        sizes.append(AssetSize(path, len(data), len(gzipped), brotli_size))
+    return sizes
+
+
+def format_report(rendered: int, sizes: list[AssetSize], output_dir: Path) -> str:
+    """Page weight table: rendered bytes versus what is now on disk, raw and precompressed."""
+    lines = [f"{'asset':<32}{'bytes':>10}{'gzip':>10}{'brotli':>10}"]
+    for size in sizes:
+        brotli = f"{size.brotli:,}" if size.brotli is not None else "-"
+        lines.append(f"{size.path.relative_to(output_dir).as_posix():<32}{size.raw:>10,}{size.gzip:>10,}{brotli:>10}")
+    page = {output_dir / "index.html", *(output_dir / ASSETS_DIR).glob("style.*.css")}
+    served = sum(size.raw for size in sizes if size.path in page)
+    lines.append(f"index.html as rendered: {rendered:,} B → served HTML + CSS: {served:,} B")
+    if _brotli() is None:
+        lines.append("· brotli not installed - .br files skipped (install the `assets` extra)")
+    return "\n".join(lines)
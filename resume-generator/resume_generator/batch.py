@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""Render every artifact for many profiles, one output subdirectory per profile.
+
+Profiles are JSON files shaped like data.json. Each one is built by the same
+incremental pipeline as ``generate-resume`` in a bounded process pool whose workers
+are recycled after a fixed number of profiles to cap memory growth.
+"""
+
+import argparse
+import contextlib
+import glob
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+import traceback
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+from . import budgets, generate_all, schema
+from .context import OUTPUT_DIR, BuildContext
+
+DEFAULT_OUTPUT_DIR = OUTPUT_DIR / "batch"
+REPORT_NAME = "batch-report.json"
+
+
+def find_profiles(patterns: list[str]) -> list[Path]:
+    """Expand directories (all ``*.json`` inside) and glob patterns into a sorted, de-duplicated list."""
+    found = set()
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            found.update(path.glob("*.json"))
+        else:
+            found.update(Path(match) for match in glob.glob(pattern, recursive=True))  # noqa: PTH207 - absolute patterns
+    return sorted(path.resolve() for path in found if path.is_file())
+
+
+def profile_names(profiles: list[Path]) -> dict[Path, str]:
+    """Output directory (and report) name of each profile: its file stem, plus a hash of its path if it is shared.
+
+    Recursive globs and several directories can yield ``a/alice.json`` and ``b/alice.json``;
+    they get ``alice-<hash>`` directories instead of overwriting each other's outputs.
+    """
+    stems = Counter(path.stem for path in profiles)
+    return {
+        path: path.stem
+        if stems[path.stem] == 1
+        else f"{path.stem}-{hashlib.sha256(str(path).encode()).hexdigest()[:8]}"
+        for path in profiles
+    }
+
+
+def check_profiles(
+    profiles: list[Path],
+    output_root: Path,
+    names: dict[Path, str] | None = None,
+) -> tuple[list[Path], list[dict]]:
+    """Split profiles into valid ones and result records for those that fail to parse or validate."""
+    names = names or profile_names(profiles)
+    valid, rejected = [], []
+    for profile_path in profiles:
+        start = time.perf_counter()
+        try:
+            with open(profile_path, encoding="utf-8") as f:
+                errors = schema.validate(json.load(f))
+        except (OSError, UnicodeDecodeError, json.JSONDecodeError) as e:
+            errors = [f"cannot read profile: {e}"]
+        if not errors:
+            valid.append(profile_path)
+            continue
+        rejected.append(
+            {
+                "profile": names[profile_path],
+                "source": str(profile_path),
+                "output": str(output_root / names[profile_path]),
+                "ok": False,
+                "built": 0,
+                "failed": [],
+                "over_budget": [],
+                "error": "\n".join(errors),
+                "seconds": round(time.perf_counter() - start, 4),
+                "log": "",
+            },
+        )
+    return valid, rejected
+
+
+def render_profile(profile_path: Path, output_root: Path, *, name: str | None = None, force: bool = False) -> dict:
+    """Build all targets of one profile into ``output_root/<name>/`` (``name`` defaults to the file stem)."""
+    name = name or profile_path.stem
+    profile_dir = output_root / name
+    buffer = io.StringIO()
+    start = time.perf_counter()
+    result = {"profile": name, "source": str(profile_path), "output": str(profile_dir)}
+    with contextlib.redirect_stdout(buffer):
+        try:
+            ctx = BuildContext(data_path=profile_path, output_dir=profile_dir, root_dir=profile_dir)
+            built, failed = generate_all.build(ctx, force=force, show_fresh=False)
+            _, unmatched, exceeded = generate_all.check_budgets(ctx)
+        except Exception:  # noqa: BLE001 - one bad profile must not stop the batch
+            result.update(ok=False, built=0, failed=[], over_budget=[], error=traceback.format_exc())
+        else:
+            result.update(
+                ok=not failed and not exceeded,
+                built=len(built),
+                failed=failed,
+                over_budget=[measurement.path.relative_to(profile_dir).as_posix() for measurement in exceeded],
+                error=budgets.format_report(exceeded, unmatched, profile_dir) if exceeded else "",
+            )
+    result.update(seconds=round(time.perf_counter() - start, 4), log=buffer.getvalue())
+    return result
+
+
+def run_batch(
+    profiles: list[Path],
+    output_root: Path,
+    jobs: int,
+    max_tasks_per_child: int,
+    *,
+    names: dict[Path, str] | None = None,
+    force: bool = False,
+) -> list[dict]:
+    """Render profiles with at most ``jobs`` workers and ``2 * jobs`` profiles in flight."""
+    names = names or profile_names(profiles)
+    results = []
+    pending = set()
+    queue = iter(profiles)
+    with ProcessPoolExecutor(max_workers=jobs, max_tasks_per_child=max_tasks_per_child) as pool:
+        while True:
+            for profile in queue:
+                pending.add(pool.submit(render_profile, profile, output_root, name=names[profile], force=force))
+                if len(pending) >= 2 * jobs:
+                    break
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                mark = "✓" if result["ok"] else "✗"
+                print(f"{mark} {result['profile']} ({result['built']} built, {result['seconds']:.2f}s)")
+                results.append(result)
+    return sorted(results, key=lambda r: r["profile"])
+
+
+def write_report(path: Path, results: list[dict], elapsed: float, jobs: int) -> dict:
+    succeeded = sum(1 for r in results if r["ok"])
+    report = {
+        "profiles": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "jobs": jobs,
+        "seconds": round(elapsed, 3),
+        "profiles_per_second": round(len(results) / elapsed, 3) if elapsed else None,
+        "results": [{k: v for k, v in r.items() if k != "log"} for r in results],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return report
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("profiles", nargs="+", help="profile JSON files, directories or glob patterns")
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        type=Path,
+        default=DEFAULT_OUTPUT_DIR,
+        help=f"root directory for per-profile outputs (default: {DEFAULT_OUTPUT_DIR})",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of worker processes (default: number of cores)",
+    )
+    parser.add_argument(
+        "--max-tasks-per-child",
+        type=int,
+        default=25,
+        help="profiles a worker renders before it is replaced, to cap memory (default: 25)",
+    )
+    parser.add_argument("--force", action="store_true", help="rebuild every artifact of every profile")
+    parser.add_argument(
+        "--precompile-templates",
+        action="store_true",
+        help="compile the portfolio templates to Python modules once, before any worker starts",
+    )
+    parser.add_argument("--report", type=Path, help=f"summary report path (default: <output-dir>/{REPORT_NAME})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    profiles = find_profiles(args.profiles)
+    if not profiles:
+        print("No profile JSON files found", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    names = profile_names(profiles)
+    profiles, rejected = check_profiles(profiles, args.output_dir, names)
+    for result in rejected:
+        print(f"✗ {result['profile']} (invalid, not rendered)")
+
+    jobs = max(1, min(args.jobs, len(profiles)))
+    if args.precompile_templates:
+        from .templating import precompile  # noqa: PLC0415 - keeps jinja2 out of the parent otherwise
+
+        precompile()
+    print(f"Rendering {len(profiles)} profiles with {jobs} workers → {args.output_dir}/")
+    results = (
+        run_batch(profiles, args.output_dir, jobs, args.max_tasks_per_child, names=names, force=args.force)
+        if profiles
+        else []
+    )
+    results = sorted(results + rejected, key=lambda r: r["profile"])
+    elapsed = time.perf_counter() - start
+
+    report_path = args.report or args.output_dir / REPORT_NAME
+    report = write_report(report_path, results, elapsed, jobs)
+    for result in results:
+        if not result["ok"]:
+            print(f"\n✗ {result['profile']}:\n{result['error'] or result['log']}", file=sys.stderr)
+
+    print(
+        f"\n{report['succeeded']}/{report['profiles']} profiles in {elapsed:.2f}s "
+        f"({report['profiles_per_second']} profiles/s) - report: {report_path}",
+    )
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
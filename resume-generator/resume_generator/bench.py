@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""Benchmark every generator stage on synthetic profiles of increasing size.
+
+Synthetic profiles are scaled copies of data.json: jobs, bullets and projects are
+cycled from the real entries, so the markup and text lengths stay realistic.
+Each entry point's import time is also measured with ``python -X importtime``, and
+the run fails if a text-only target imports reportlab or a PDF target imports jinja2.
+Results are written as JSON; ``--compare`` checks them against a stored baseline
+and exits non-zero when a stage got slower than the threshold allows.
+"""
+
+import argparse
+import copy
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from .context import DATA_PATH, PACKAGE_DIR, BuildContext
+
+# name -> (jobs, bullets per job)
+SIZES = {
+    "small": (4, 10),
+    "medium": (50, 20),
+    "large": (500, 20),
+}
+DEFAULT_THRESHOLD = 0.25
+# Differences below this are timer noise, not regressions
+NOISE_FLOOR_MS = 0.5
+
+# Entry point -> (code run under `python -X importtime`, top-level packages it must not import)
+IMPORT_CHECKS = {
+    "generate_all": ("import resume_generator.generate_all", {"reportlab", "jinja2"}),
+    "generate_readme": (
+        "from resume_generator import context, generate_readme as m; m.render_readme(context.BuildContext().data)",
+        {"reportlab", "jinja2"},
+    ),
+    "generate_linkedin": (
+        "from resume_generator import context, generate_linkedin as m; m.render_linkedin(context.BuildContext().data)",
+        {"reportlab", "jinja2"},
+    ),
+    "generate_resume": (
+        (
+            "from resume_generator import context, generate_resume as m; c = context.BuildContext(); "
+            "m.build_story(c, next(iter(c.variants)))"
+        ),
+        {"jinja2"},
+    ),
+    "generate_portfolio": (
+        "from resume_generator import context, generate_portfolio as m; m.render_html(context.BuildContext())",
+        {"reportlab"},
+    ),
+}
+
+
+def synthetic_profile(base: dict, jobs: int, bullets_per_job: int) -> dict:
+    profile = copy.deepcopy(base)
+    variants = list(base.get("variants", {}))
+    source_jobs = base["experience"]
+    experience = []
+    for i in range(jobs):
+        job = copy.deepcopy(source_jobs[i % len(source_jobs)])
+        job["company"] = f"{job['company']} #{i + 1}"
+        bullets = job.get("bullets") or [{"text": "Shipped a feature", "resumes": variants}]
+        job["bullets"] = []
+        for b in range(bullets_per_job):
+            bullet = dict(bullets[b % len(bullets)])
+            bullet["text"] = f"{bullet.get('text', '')} ({i + 1}.{b + 1})"
+            job["bullets"].append(bullet)
+        experience.append(job)
+    profile["experience"] = experience
+
+    projects = base.get("projects", [])
+    if projects:
+        profile["projects"] = []
+        for i in range(max(jobs, len(projects))):
+            project = dict(projects[i % len(projects)])
+            project["title"] = f"{project['title']} #{i + 1}"
+            profile["projects"].append(project)
+    return profile
+
+
+def _time(fn, repeat: int, setup=None) -> dict:
+    """Run ``fn(setup())`` ``repeat`` times with GC paused; setup time is not counted."""
+    samples = []
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            fn(arg)
+            samples.append((time.perf_counter() - start) * 1000)
+        finally:
+            gc.enable()
+    return {"min_ms": round(min(samples), 3), "median_ms": round(statistics.median(samples), 3)}
+
+
+def bench_profile(data: dict, variant: str, repeat: int) -> dict:
+    from .generate_linkedin import render_linkedin  # noqa: PLC0415
+    from .generate_portfolio import portfolio_view, render_html  # noqa: PLC0415
+    from .generate_readme import render_readme  # noqa: PLC0415
+    from .generate_resume import build_story  # noqa: PLC0415
+    from .shared import build_styles, clear_layout_caches, make_doc  # noqa: PLC0415
+    from .variants import compile_variants  # noqa: PLC0415
+
+    encoded = json.dumps(data, ensure_ascii=False)
+    warm = BuildContext(data=data)
+    warm.variants = compile_variants(data)
+    warm.styles(variant)  # resolve the variant's fonts and build their style sheet once
+    render_html(warm)  # compile the template once, outside the measurement
+    view = portfolio_view(data)
+
+    def story_ctx(_=None):
+        ctx = BuildContext(data=data)
+        ctx.fonts, ctx.variants, ctx.jinja_env = warm.fonts, warm.variants, warm.jinja_env
+        return ctx
+
+    # The layout caches outlive a sample: cold stages empty them first, so parsing and
+    # line breaking are measured, and *_warm stages time what a second document pays
+    def cold_story_ctx():
+        clear_layout_caches()
+        return story_ctx()
+
+    def cold_story():
+        story = build_story(story_ctx(), variant)
+        clear_layout_caches()
+        return story
+
+    def pdf_build(story):
+        make_doc(io.BytesIO()).build(story)
+
+    def markdown(_):
+        render_readme(data)
+        render_linkedin(data)
+
+    return {
+        "json_load": _time(lambda _: json.loads(encoded), repeat),
+        "build_styles": _time(lambda _: build_styles(), repeat),
+        "compile_variants": _time(lambda _: compile_variants(data), repeat),
+        "story": _time(lambda ctx: build_story(ctx, variant), repeat, setup=cold_story_ctx),
+        "story_warm": _time(lambda ctx: build_story(ctx, variant), repeat, setup=story_ctx),
+        "pdf_build": _time(pdf_build, repeat, setup=cold_story),
+        "pdf_build_warm": _time(pdf_build, repeat, setup=lambda: build_story(story_ctx(), variant)),
+        "portfolio_view": _time(lambda _: portfolio_view(data), repeat),
+        "template_render": _time(lambda ctx: render_html(ctx, view=view), repeat, setup=story_ctx),
+        "markdown": _time(markdown, repeat),
+    }
+
+
+def _importtime(code: str) -> list[tuple[int, int, str]]:
+    """(depth, cumulative µs, module) for every import made while running ``code``."""
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(filter(None, [str(PACKAGE_DIR.parent), os.environ.get("PYTHONPATH")])),
+    }
+    proc = subprocess.run(  # noqa: S603 - runs our own interpreter on fixed snippets
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    imports = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        imports.append(((len(name) - len(name.lstrip())) // 2, int(cumulative), name.strip()))
+    return imports
+
+
+def bench_imports() -> dict:
+    """Import time of each entry point (interpreter startup excluded) and any forbidden imports it made."""
+    startup = {name for _, _, name in _importtime("pass")}
+    results = {}
+    for entry_point, (code, forbidden) in IMPORT_CHECKS.items():
+        imports = [(depth, us, name) for depth, us, name in _importtime(code) if name not in startup]
+        loaded = {name for _, _, name in imports}
+        results[entry_point] = {
+            "total_ms": round(sum(us for depth, us, _ in imports if depth == 0) / 1000, 3),
+            "modules": len(loaded),
+            "forbidden": sorted(name for name in loaded if name.split(".")[0] in forbidden),
+        }
+    return results
+
+
+def run(sizes: list[str], repeat: int, variant: str | None = None) -> dict:
+    with open(DATA_PATH, encoding="utf-8") as f:
+        base = json.load(f)
+    variant = variant or next(iter(base.get("variants", {})))
+
+    results = {}
+    for size in sizes:
+        jobs, bullets_per_job = SIZES[size]
+        profile = synthetic_profile(base, jobs, bullets_per_job)
+        print(f"… {size}: {jobs} jobs, {jobs * bullets_per_job} bullets", file=sys.stderr)
+        results[size] = {
+            "jobs": jobs,
+            "bullets": jobs * bullets_per_job,
+            "stages": bench_profile(profile, variant, repeat),
+        }
+    print("… imports: python -X importtime per entry point", file=sys.stderr)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "variant": variant,
+        },
+        "results": results,
+        "imports": bench_imports(),
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Print a stage-by-stage comparison; returns the regressed ``size/stage`` names."""
+    regressions = []
+    print(f"\n{'stage':<28}{'baseline ms':>14}{'current ms':>14}{'ratio':>9}")
+    for size, result in current["results"].items():
+        base_stages = baseline.get("results", {}).get(size, {}).get("stages", {})
+        for stage, timing in result["stages"].items():
+            if stage not in base_stages:
+                continue
+            before, after = base_stages[stage]["min_ms"], timing["min_ms"]
+            ratio = after / before if before else float("inf")
+            regressed = ratio > 1 + threshold and after - before > NOISE_FLOOR_MS
+            mark = "  ✗" if regressed else ""
+            print(f"{size + '/' + stage:<28}{before:>14.3f}{after:>14.3f}{ratio:>9.2f}{mark}")
+            if regressed:
+                regressions.append(f"{size}/{stage}")
+
+    for entry_point, result in current.get("imports", {}).items():
+        if entry_point not in baseline.get("imports", {}):
+            continue
+        before, after = baseline["imports"][entry_point]["total_ms"], result["total_ms"]
+        ratio = after / before if before else float("inf")
+        regressed = ratio > 1 + threshold and after - before > NOISE_FLOOR_MS
+        mark = "  ✗" if regressed else ""
+        print(f"{'imports/' + entry_point:<28}{before:>14.3f}{after:>14.3f}{ratio:>9.2f}{mark}")
+        if regressed:
+            regressions.append(f"imports/{entry_point}")
+    return regressions
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        default=",".join(SIZES),
+        help=f"comma-separated profile sizes to run (default: {','.join(SIZES)})",
+    )
+    parser.add_argument(
+        "--imports-only",
+        action="store_true",
+        help="only run the import-time checks (no synthetic profile stages)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage; min and median are reported")
+    parser.add_argument("--variant", help="resume variant to build (default: first declared in data.json)")
+    parser.add_argument("-o", "--output", type=Path, help="write results JSON here (default: stdout)")
+    parser.add_argument("--compare", type=Path, metavar="BASELINE", help="baseline results JSON to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"allowed slowdown ratio before a stage counts as regressed (default: {DEFAULT_THRESHOLD})",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    sizes = [] if args.imports_only else [size.strip() for size in args.sizes.split(",") if size.strip()]
+    unknown = [size for size in sizes if size not in SIZES]
+    if unknown:
+        print(f"Unknown sizes: {', '.join(unknown)} (choose from {', '.join(SIZES)})", file=sys.stderr)
+        return 2
+
+    current = run(sizes, args.repeat, args.variant)
+    encoded = json.dumps(current, indent=2) + "\n"
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(encoded, encoding="utf-8")
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(encoded, end="")
+
+    leaks = {name: r["forbidden"] for name, r in current["imports"].items() if r["forbidden"]}
+    for entry_point, modules in leaks.items():
+        print(f"✗ {entry_point} imports {', '.join(modules)}", file=sys.stderr)
+    if leaks:
+        return 1
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regressions: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+        print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""Size and page-count budgets of the generated artifacts, from ``budgets`` in data.json.
+
+``pages`` maps variant names (or fnmatch patterns such as ``*``) to the most pages the
+variant's PDF may have. ``artifacts`` maps glob patterns relative to the repository
+root (``output/...`` ones to the context's output directory, so they also match a
+batch profile's own directory) to a ``bytes`` and/or ``gzip_bytes`` limit; gzip sizes are measured at level 9,
+as the precompressed files are written. When several patterns match, the strictest
+limit applies. Every PDF and every file matched by a pattern is measured after the
+build, whether or not it was rebuilt, so the report always reflects what ships.
+"""
+
+import gzip
+import re
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import NamedTuple
+
+from .context import OUTPUT_DIR, BuildContext
+
+MEASURES = ("bytes", "gzip_bytes", "pages")
+# One page object per page; ReportLab writes page dictionaries uncompressed
+_PAGE = re.compile(rb"/Type\s*/Page(?![a-zA-Z])")
+
+
+class Measurement(NamedTuple):
+    path: Path
+    bytes: int
+    gzip_bytes: int
+    pages: int | None
+    # Measure name -> its budget
+    limits: dict[str, int]
+
+    @property
+    def violations(self) -> list[str]:
+        """Measures over their budget."""
+        return [measure for measure, limit in self.limits.items() if getattr(self, measure) > limit]
+
+
+def pdf_pages(content: bytes) -> int:
+    return len(_PAGE.findall(content))
+
+
+def _tighten(limits: dict[str, int], measure: str, limit: int):
+    limits[measure] = min(limits.get(measure, limit), limit)
+
+
+def _matches(ctx: BuildContext, pattern: str) -> list[Path]:
+    head, separator, rest = pattern.partition("/")
+    base, pattern = (ctx.output_dir, rest) if separator and head == OUTPUT_DIR.name else (ctx.root_dir, pattern)
+    return sorted(path for path in base.glob(pattern) if path.is_file())
+
+
+def measure(ctx: BuildContext, pdfs: dict[str, Path]) -> tuple[list[Measurement], list[str]]:
+    """Measurements of the variant PDFs (``variant -> path``) and budgeted files, plus patterns matching nothing."""
+    budgets = ctx.data.get("budgets", {})
+    limits: dict[Path, dict[str, int]] = {}
+    for variant, path in pdfs.items():
+        limits[path] = {}
+        for pattern, max_pages in budgets.get("pages", {}).items():
+            if fnmatchcase(variant, pattern):
+                _tighten(limits[path], "pages", max_pages)
+
+    unmatched = []
+    for pattern, rule in budgets.get("artifacts", {}).items():
+        paths = _matches(ctx, pattern)
+        if not paths:
+            unmatched.append(pattern)
+        for path in paths:
+            for key in MEASURES:
+                if key in rule:
+                    _tighten(limits.setdefault(path, {}), key, rule[key])
+
+    measurements = []
+    for path, path_limits in limits.items():
+        if not path.is_file():
+            continue
+        content = path.read_bytes()
+        gzipped = len(gzip.compress(content, compresslevel=9, mtime=0))
+        pages = pdf_pages(content) if path.suffix == ".pdf" else None
+        measurements.append(Measurement(path, len(content), gzipped, pages, path_limits))
+    return measurements, unmatched
+
+
+def _value(measurement: Measurement, measure: str) -> str:
+    value = getattr(measurement, measure)
+    text = f"{value} pages" if measure == "pages" else f"{value:,} B"
+    if measure == "gzip_bytes":
+        text = f"gzip {text}"
+    limit = measurement.limits.get(measure)
+    if limit is None:
+        return text
+    return f"{text} ({'>' if value > limit else '≤'} {limit:,})"
+
+
+def format_report(measurements: list[Measurement], unmatched: list[str], root_dir: Path) -> str:
+    """One line per artifact: its size, gzip size and page count, each against its budget if it has one."""
+    lines = []
+    for measurement in measurements:
+        marker = "✗" if measurement.violations else "✓" if measurement.limits else "·"
+        measures = [m for m in MEASURES if getattr(measurement, m) is not None]
+        values = ", ".join(_value(measurement, m) for m in measures)
+        lines.append(f"{marker} {measurement.path.relative_to(root_dir).as_posix()}: {values}")
+    lines.extend(f"⚠ budget pattern {pattern!r} matches no file" for pattern in unmatched)
+    return "\n".join(lines)
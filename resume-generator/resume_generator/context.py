@@ -0,0 +1,133 @@
+"""Build context shared by all generators within one run.
+
+Parses data.json once and lazily builds the ReportLab style sheet and looks up the
+Jinja2 environment on first use, so a run that renders every target pays for each only once.
+"""
+
+import json
+from functools import cached_property
+from pathlib import Path
+
+from .profiling import span
+
+PACKAGE_DIR = Path(__file__).parent
+ROOT_DIR = PACKAGE_DIR.parent.parent
+DATA_PATH = ROOT_DIR / "data.json"
+OUTPUT_DIR = ROOT_DIR / "output"
+TEMPLATES_DIR = PACKAGE_DIR.parent / "templates"
+CACHE_DIR = PACKAGE_DIR.parent / ".cache"
+
+
+class BuildContext:
+    def __init__(
+        self,
+        data: dict | None = None,
+        data_path: Path = DATA_PATH,
+        output_dir: Path = OUTPUT_DIR,
+        root_dir: Path = ROOT_DIR,
+        templates_dir: Path = TEMPLATES_DIR,
+        *,
+        optimize_assets: bool = False,
+        max_pages: int | None = None,
+        optimize_images: bool = False,
+        image_budget: int | None = None,
+        font: str | None = None,
+        fragment_cache: bool = False,
+    ) -> None:
+        self.data_path = Path(data_path)
+        self.output_dir = Path(output_dir)
+        self.root_dir = Path(root_dir)
+        self.templates_dir = Path(templates_dir)
+        # Minify, fingerprint and precompress the portfolio after rendering (see ``assets``)
+        self.optimize_assets = optimize_assets
+        # Trim PDF experience bullets until each resume fits this many pages
+        self.max_pages = max_pages
+        # Re-encode the README animation within ``image_budget`` bytes and resize portfolio images (see ``images``)
+        self.optimize_images = optimize_images
+        self.image_budget = image_budget
+        # PDF font family (see ``shared.FONT_FAMILIES``); None picks Helvetica unless the text needs Unicode glyphs
+        self.font = font
+        # Variant name -> the fonts its PDF is drawn in, resolved on first use by ``styles``
+        self.fonts: dict = {}
+        # Cache rendered portfolio fragments on disk (see ``generate_portfolio.FragmentCache``)
+        self.fragment_cache = fragment_cache
+        if data is not None:
+            self.data = data
+
+    @cached_property
+    def data(self) -> dict:
+        """Parsed data.json (or the dict passed in)."""
+        with span("load_data"), open(self.data_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    @cached_property
+    def schema_errors(self) -> list[str]:
+        """Every problem the data.json schema finds in ``data``; empty when the profile is valid."""
+        from .schema import validate  # noqa: PLC0415
+
+        with span("validate"):
+            return validate(self.data)
+
+    def reload(self, *, templates: bool = False):
+        """Forget everything derived from data.json (and the Jinja environment with ``templates``), keep the options.
+
+        The next access re-reads ``data_path``; watch mode calls this after each change.
+        """
+        for name in ("data", "schema_errors", "variants", *(("jinja_env",) if templates else ())):
+            self.__dict__.pop(name, None)
+        self.fonts.clear()
+
+    def check_schema(self):
+        """Raise ``schema.ValidationError`` listing every problem if the profile is invalid."""
+        if self.schema_errors:
+            from .schema import ValidationError  # noqa: PLC0415
+
+            raise ValidationError(self.schema_errors, self.data_path.name)
+
+    @cached_property
+    def variants(self) -> dict:
+        """Resume variants from data.json, compiled into a per-variant index."""
+        from .variants import compile_variants  # noqa: PLC0415
+
+        with span("compile_variants"):
+            return compile_variants(self.data)
+
+    def styles(self, variant: str):
+        """ReportLab style sheet for ``variant``'s PDF, in the fonts the text it draws needs."""
+        # Text-only targets never need reportlab
+        with span("import.reportlab", "import"):
+            from .shared import select_fonts, styles_for, variant_texts  # noqa: PLC0415
+
+        if variant not in self.fonts:
+            self.fonts[variant] = select_fonts(variant_texts(self.data, self.variants[variant]), self.font)
+        return styles_for(self.fonts[variant])
+
+    @cached_property
+    def jinja_env(self):
+        """Process-wide Jinja2 environment for the portfolio templates (see ``templating``)."""
+        with span("import.jinja2", "import"):
+            from .templating import environment  # noqa: PLC0415 - PDF targets never need jinja2
+
+        return environment(self.templates_dir)
+
+    @property
+    def options(self) -> dict:
+        """Keyword arguments that recreate this context's build options (e.g. in a worker process)."""
+        return {
+            "optimize_assets": self.optimize_assets,
+            "max_pages": self.max_pages,
+            "optimize_images": self.optimize_images,
+            "image_budget": self.image_budget,
+            "font": self.font,
+            "fragment_cache": self.fragment_cache,
+        }
+
+    @property
+    def file_prefix(self) -> str:
+        """Output file name prefix derived from ``personal.name``, e.g. ``Jane_Doe``."""
+        return self.data["personal"]["name"].replace(" ", "_")
+
+    @property
+    def portfolio_dir(self) -> Path:
+        """Default output directory of the portfolio site."""
+        return self.output_dir / "portfolio"
@@ -1,37 +1,410 @@
 #!/usr/bin/env python3
 """Generate all resume variants, README, portfolio, and LinkedIn texts."""
 
+import argparse
+import contextlib
+import io
+import os
 import sys
+import time
+import traceback
+import tracemalloc
+from importlib import import_module
 from pathlib import Path
+from typing import NamedTuple
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from .generate_backend_crypto import generate as gen_backend_crypto
-from .generate_backend_traditional import generate as gen_backend_traditional
-from .generate_cto import generate as gen_cto
-from .generate_linkedin import generate as gen_linkedin
-from .generate_portfolio import generate as gen_portfolio
-from .generate_readme import generate as gen_readme
-from .generate_techlead_crypto import generate as gen_techlead_crypto
-from .generate_techlead_traditional import generate as gen_techlead_traditional
+from . import budgets, images, manifest, profiling
+from .context import OUTPUT_DIR, PACKAGE_DIR, ROOT_DIR, TEMPLATES_DIR, BuildContext
+from .generate_readme import BANNER as README_BANNER
 
 
-def main():
-    root_dir = Path(__file__).parent.parent.parent
-    output_dir = root_dir / "output"
-    output_dir.mkdir(exist_ok=True)
+class Target(NamedTuple):
+    """One independent build target and everything its output depends on."""
 
-    gen_backend_crypto(str(output_dir / "Arkadiy_Pechnikov_Resume_Backend_Crypto.pdf"))
-    gen_backend_traditional(str(output_dir / "Arkadiy_Pechnikov_Resume_Backend.pdf"))
-    gen_techlead_crypto(str(output_dir / "Arkadiy_Pechnikov_Resume_TechLead_Crypto.pdf"))
-    gen_techlead_traditional(str(output_dir / "Arkadiy_Pechnikov_Resume_TechLead.pdf"))
-    gen_cto(str(output_dir / "Arkadiy_Pechnikov_Resume_CTO.pdf"))
-    gen_readme(str(root_dir / "README.md"))
-    gen_portfolio(str(output_dir / "portfolio"))
-    gen_linkedin(str(output_dir / "linkedin_texts.md"))
+    name: str
+    module: str
+    output: Path
+    data_keys: tuple[str, ...]
+    sources: tuple[Path, ...]
+    artifacts: tuple[Path, ...]
+    variant: str | None = None
+    # Build options that change the output, recorded with the input hashes
+    options: dict | None = None
 
-    print(f"\nAll files generated in {output_dir}/")
+
+PDF_SOURCES = (
+    PACKAGE_DIR / "generate_resume.py",
+    PACKAGE_DIR / "variants.py",
+    PACKAGE_DIR / "shared.py",
+    PACKAGE_DIR / "context.py",
+)
+PORTFOLIO_DATA_KEYS = (
+    "personal",
+    "meta",
+    "seo",
+    "titles.portfolio",
+    "summaries.portfolio",
+    "stats",
+    "skills",
+    "skills_by_resume.backend_crypto",
+    "experience",
+    "projects",
+    "education",
+    "languages",
+    "linkedin.cta",
+    "analytics",
+)
+
+
+def _pdf_target(ctx: BuildContext, variant: str, file_suffix: str) -> Target:
+    output = ctx.output_dir / f"{ctx.file_prefix}_Resume_{file_suffix}.pdf"
+    return Target(
+        name=variant,
+        module="generate_resume",
+        output=output,
+        data_keys=(
+            "personal",
+            f"variants.{variant}",
+            f"titles.{variant}",
+            f"summaries.{variant}",
+            "skills",
+            f"skills_by_resume.{variant}",
+            "experience",
+            "education",
+            "languages",
+        ),
+        sources=PDF_SOURCES,
+        artifacts=(output,),
+        variant=variant,
+        options={key: value for key, value in (("max_pages", ctx.max_pages), ("font", ctx.font)) if value} or None,
+    )
+
+
+def build_targets(ctx: BuildContext) -> list[Target]:
+    """One PDF target per variant declared in data.json, followed by the text targets."""
+    variants = ctx.data.get("variants", {})
+    targets = [_pdf_target(ctx, name, spec.get("file_suffix", name)) for name, spec in variants.items()]
+    readme = ctx.root_dir / "README.md"
+    linkedin = ctx.output_dir / "linkedin_texts.md"
+    image_options = {"optimize_images": True, "image_budget": ctx.image_budget} if ctx.optimize_images else None
+    image_sources = (PACKAGE_DIR / "images.py",) if ctx.optimize_images else ()
+    return [
+        *targets,
+        Target(
+            name="readme",
+            module="generate_readme",
+            output=readme,
+            data_keys=("personal", "social", "readme"),
+            sources=(
+                PACKAGE_DIR / "generate_readme.py",
+                PACKAGE_DIR / "context.py",
+                *image_sources,
+                *((ctx.root_dir / README_BANNER,) if ctx.optimize_images else ()),
+            ),
+            artifacts=(readme,),
+            options=image_options,
+        ),
+        Target(
+            name="portfolio",
+            module="generate_portfolio",
+            output=ctx.portfolio_dir,
+            data_keys=PORTFOLIO_DATA_KEYS,
+            sources=(
+                PACKAGE_DIR / "generate_portfolio.py",
+                PACKAGE_DIR / "assets.py",
+                PACKAGE_DIR / "context.py",
+                TEMPLATES_DIR / "portfolio.html.j2",
+                *sorted((TEMPLATES_DIR / "fragments").glob("*.j2")),
+                *image_sources,
+            ),
+            # The .gz sibling only exists with --optimize-assets, so toggling the flag rebuilds the site
+            artifacts=(
+                ctx.portfolio_dir / "index.html",
+                *((ctx.portfolio_dir / "index.html.gz",) if ctx.optimize_assets else ()),
+            ),
+            options=image_options,
+        ),
+        Target(
+            name="linkedin",
+            module="generate_linkedin",
+            output=linkedin,
+            data_keys=("personal", "linkedin", "experience", "skills"),
+            sources=(PACKAGE_DIR / "generate_linkedin.py", PACKAGE_DIR / "context.py"),
+            artifacts=(linkedin,),
+        ),
+    ]
+
+
+# Per-process build context, created once by the pool initializer and reused by every task
+_worker_ctx: BuildContext | None = None
+
+
+def _init_worker(data: dict, output_dir: Path, root_dir: Path, options: dict):
+    global _worker_ctx  # noqa: PLW0603
+    _worker_ctx = BuildContext(data=data, output_dir=output_dir, root_dir=root_dir, **options)
+    profiling.disable()  # a forked worker must not inherit the parent's recording
+
+
+def _run_target(
+    target: Target,
+    ctx: BuildContext | None = None,
+    *,
+    profile: bool = False,
+    track_memory: bool = False,
+) -> tuple[bool, str, float, list[dict]]:
+    """Run one generator, capturing its output (and trace events) so results can be printed in order."""
+    buffer = io.StringIO()
+    owns_recording = profile and not profiling.is_enabled()
+    if owns_recording:
+        profiling.enable()
+    if track_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    ok = True
+    with contextlib.redirect_stdout(buffer), profiling.span(target.name, "target") as event_args:
+        try:
+            with profiling.span(f"import.{target.module}", "import"):
+                module = import_module(f"resume_generator.{target.module}")
+            kwargs = {"variant": target.variant} if target.variant else {}
+            module.generate(str(target.output), ctx=ctx or _worker_ctx, **kwargs)
+        except Exception:  # noqa: BLE001 - a failing target must not abort the others
+            ok = False
+            buffer.write(traceback.format_exc())
+        if track_memory:
+            event_args["peak_kib"] = tracemalloc.get_traced_memory()[1] // 1024
+            tracemalloc.stop()
+    elapsed = time.perf_counter() - start
+    return ok, buffer.getvalue(), elapsed, profiling.disable() if owns_recording else []
+
+
+def check_budgets(ctx: BuildContext) -> tuple[list[budgets.Measurement], list[str], list[budgets.Measurement]]:
+    """Measure ``ctx``'s PDFs and budgeted artifacts: (measurements, patterns matching nothing, those over budget)."""
+    pdfs = {target.variant: target.output for target in build_targets(ctx) if target.variant}
+    measurements, unmatched = budgets.measure(ctx, pdfs)
+    return measurements, unmatched, [measurement for measurement in measurements if measurement.violations]
+
+
+def build(
+    ctx: BuildContext,
+    jobs: int = 1,
+    *,
+    force: bool = False,
+    show_fresh: bool = True,
+    profile: bool = False,
+    track_memory: bool = False,
+) -> tuple[list, list]:
+    """Build every stale target and update the manifest; returns (built targets, failed target names).
+
+    Raises ``schema.ValidationError`` before any target is built if the profile is invalid.
+    """
+    ctx.check_schema()
+    ctx.output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = ctx.output_dir / manifest.MANIFEST_NAME
+    build_manifest = manifest.load_manifest(manifest_path)
+    recorded = build_manifest["targets"]
+
+    targets = build_targets(ctx)
+    inputs = {t.name: manifest.input_hashes(ctx.data, t.data_keys, t.sources, ROOT_DIR) for t in targets}
+    for target in targets:
+        if target.options:
+            inputs[target.name]["options"] = target.options
+    stale = [
+        t
+        for t in targets
+        if force
+        or not manifest.is_fresh(
+            recorded.get(t.name),
+            inputs[t.name],
+            manifest.output_hashes(t.artifacts, ctx.root_dir),
+        )
+    ]
+    if show_fresh:
+        for target in targets:
+            if target not in stale:
+                print(f"· {target.name} (up to date)")
+
+    jobs = max(1, min(jobs, len(stale)))
+    if jobs == 1:
+        results = [_run_target(t, ctx, profile=profile, track_memory=track_memory) for t in stale]
+    else:
+        # multiprocessing is only worth importing when the pool is actually used
+        from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415
+
+        init_args = (ctx.data, ctx.output_dir, ctx.root_dir, ctx.options)
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=init_args) as pool:
+            futures = [pool.submit(_run_target, t, profile=profile, track_memory=track_memory) for t in stale]
+            results = [future.result() for future in futures]
+
+    failed = []
+    for target, (ok, output, elapsed, events) in zip(stale, results, strict=True):
+        profiling.record(events)
+        print(output, end="")
+        print(f"{'✓' if ok else '✗'} {target.name} ({elapsed:.2f}s)")
+        if ok:
+            recorded[target.name] = {
+                "inputs": inputs[target.name],
+                "outputs": manifest.output_hashes(target.artifacts, ctx.root_dir),
+            }
+        else:
+            recorded.pop(target.name, None)
+            failed.append(target.name)
+    manifest.save_manifest(manifest_path, build_manifest)
+    return stale, failed
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of targets to build in parallel (default: number of cores, 1 = sequential)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="rebuild every target, even if its inputs are unchanged since the last run",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="stay resident and rebuild the affected targets whenever data.json, templates or generators change",
+    )
+    parser.add_argument(
+        "--serve",
+        type=int,
+        nargs="?",
+        const=8000,
+        metavar="PORT",
+        help="with --watch, serve output/portfolio/ on localhost with live reload (default port: 8000)",
+    )
+    parser.add_argument(
+        "--optimize-assets",
+        action="store_true",
+        help="minify the portfolio, move its CSS to a content-hashed file and write .gz/.br siblings",
+    )
+    parser.add_argument(
+        "--optimize-images",
+        action="store_true",
+        help="re-encode the README animation within --image-budget and resize the portfolio's og:image (needs Pillow)",
+    )
+    parser.add_argument(
+        "--image-budget",
+        type=int,
+        metavar="KB",
+        help=f"byte budget of the README animation in KiB (default: {images.DEFAULT_BUDGET // 1024})",
+    )
+    parser.add_argument(
+        "--max-pages",
+        type=int,
+        metavar="N",
+        help="trim experience bullets (each job keeps its first ones, recent jobs keep more) so every PDF fits N pages",
+    )
+    parser.add_argument(
+        "--font",
+        metavar="FAMILY",
+        help="PDF font: Helvetica, or a TTF family such as DejaVuSans (default: Helvetica unless the text needs "
+        "glyphs it lacks, then the first installed Unicode family)",
+    )
+    parser.add_argument(
+        "--precompile-templates",
+        action="store_true",
+        help="compile the portfolio templates to Python modules up front (reused until a template changes)",
+    )
+    parser.add_argument(
+        "--fragment-cache",
+        action="store_true",
+        help="cache rendered portfolio sections in .cache/fragments/; an edit re-renders only the sections it touches",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="record per-stage timings, print a summary and write a Chrome trace (see --trace)",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="with --profile, also record each target's tracemalloc peak (slows the build down)",
+    )
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        default=OUTPUT_DIR / "trace.json",
+        help="where --profile writes the Chrome trace-event file (default: output/trace.json)",
+    )
+    args = parser.parse_args(argv)
+    if args.serve is not None and not args.watch:
+        parser.error("--serve requires --watch")
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    start = time.perf_counter()
+    # Before the context is built, so the trace covers load_data and validate
+    if args.profile and not args.watch:
+        profiling.enable()
+    ctx = BuildContext(
+        optimize_assets=args.optimize_assets,
+        max_pages=args.max_pages,
+        optimize_images=args.optimize_images,
+        image_budget=args.image_budget * 1024 if args.image_budget else None,
+        font=args.font,
+        fragment_cache=args.fragment_cache,
+    )
+    if ctx.font:
+        from .shared import select_fonts  # noqa: PLC0415
+
+        try:
+            # Registered before any worker starts, so forked workers inherit the parsed fonts
+            select_fonts((), ctx.font)
+        except (ValueError, FileNotFoundError) as e:
+            print(f"✗ {e}", file=sys.stderr)
+            return 1
+    if args.watch:
+        from .watch import watch  # noqa: PLC0415
+
+        # Same options as a one-shot build, so the preview matches what CI builds
+        return watch(ctx, args.jobs, force=args.force, serve_port=args.serve)
+    if ctx.schema_errors:
+        print(f"✗ {ctx.data_path.name} is invalid:", file=sys.stderr)
+        for error in ctx.schema_errors:
+            print(f"  - {error}", file=sys.stderr)
+        return 1
+    if args.precompile_templates:
+        from .templating import precompile  # noqa: PLC0415
+
+        print(f"· templates precompiled to {precompile()}")
+    built, failed = build(
+        ctx,
+        args.jobs,
+        force=args.force,
+        profile=args.profile,
+        track_memory=args.profile and args.profile_memory,
+    )
+    total = time.perf_counter() - start
+
+    if args.profile:
+        events = profiling.disable()
+        profiling.write_chrome_trace(args.trace, events)
+        print(f"\n{profiling.summary(events)}\n\nTrace written to {args.trace} (open in chrome://tracing or Perfetto)")
+    if failed:
+        print(f"\n{len(failed)} of {len(built)} targets failed: {', '.join(failed)}", file=sys.stderr)
+        return 1
+
+    print(f"\nBuilt {len(built)} targets in {ctx.output_dir}/ ({total:.2f}s)")
+
+    measurements, unmatched, exceeded = check_budgets(ctx)
+    print(f"\nBudgets:\n{budgets.format_report(measurements, unmatched, ctx.root_dir)}")
+    if exceeded:
+        print(f"\n✗ {len(exceeded)} artifacts over budget", file=sys.stderr)
+        return 1
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -3,7 +3,9 @@
 
 from pathlib import Path
 
-from .shared import load_data
+from .context import BuildContext
+from .outputs import write_if_changed
+from .profiling import span, traced
 
 
 def _format_experience(data: dict) -> str:
@@ -66,9 +68,8 @@ def _format_skills(data: dict) -> str:
     return "\n".join(lines)
 
 
-def generate(output_path: str = "output/linkedin_texts.md"):
-    data = load_data()
-
+@traced("markdown")
+def render_linkedin(data: dict) -> str:
     linkedin = data["linkedin"]
     personal = data["personal"]
 
@@ -81,7 +82,7 @@ def generate(output_path: str = "output/linkedin_texts.md"):
 
     contact = f"{personal['email']} | t.me/{personal['telegram']}"
 
-    content = f"""# LinkedIn Profile Texts
+    return f"""# LinkedIn Profile Texts
 
 Ready-to-copy texts for LinkedIn profile.
 
@@ -108,13 +109,22 @@ Ready-to-copy texts for LinkedIn profile.
 {cta}
 """
 
+
+def render(ctx: BuildContext | None = None) -> bytes:
+    """The LinkedIn texts as UTF-8 Markdown."""
+    return render_linkedin((ctx or BuildContext()).data).encode("utf-8")
+
+
+def generate(output_path: str = "output/linkedin_texts.md", ctx: BuildContext | None = None):
+    content = render(ctx)
+
     path = Path(output_path)
     path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(path, "w", encoding="utf-8") as file:
-        file.write(content)
+    with span("write"):
+        written = write_if_changed(path, content)
 
-    print(f"LinkedIn texts generated: {path}")
+    print(f"LinkedIn texts generated: {path}{'' if written else ' (unchanged)'}")
 
 
 if __name__ == "__main__":
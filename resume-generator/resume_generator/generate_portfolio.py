@@ -2,90 +2,404 @@
 """Generate portfolio website from data.json via Jinja2 template.
 
 Architecture:
-  - resume-generator/templates/portfolio.html.j2 - Jinja2 template
+  - resume-generator/templates/portfolio.html.j2 - Jinja2 page template
+  - resume-generator/templates/fragments/        - sections rendered through the fragment cache
   - output/portfolio/index.html                  - rendered static HTML
+  - output/portfolio/data.<hash>.js              - the data the page's scripts read
   - data.json is the single source of truth for ALL content
+
+The SEO block, hero, stats, skills and every experience entry and featured project
+are fragments: each is rendered from its own template with only the data it reads.
+With ``fragment_cache`` they are cached on disk under a hash of both, so after a
+one-job edit one fragment is rendered and the rest of the page is assembled from
+the cache.
 """
 
+import hashlib
 import json
+import os
 import re
 from datetime import date
+from functools import lru_cache
 from pathlib import Path
 
-from jinja2 import Environment, FileSystemLoader
+from .context import CACHE_DIR, BuildContext
+from .outputs import write_if_changed, write_text_if_changed
+from .profiling import span
+
+# Skill categories shown on the portfolio
+PORTFOLIO_SKILLS = "backend_crypto"
+# Resumes whose experience bullets the portfolio shows
+PORTFOLIO_RESUMES = ("backend_crypto", "techlead_crypto")
+PERSONAL_KEYS = ("name", "email", "telegram", "linkedin", "github", "open_to")
+# Decorative `git log` hashes of the experience entries, cycled
+COMMIT_HASHES = ("a3f7c1e", "b8e2d4a", "c5a1f9b", "d2c8e7f", "e1f0a8c", "f3d2b1a", "a7b8c9d", "d0e1f2a")
+# Size Open Graph consumers (LinkedIn, Telegram, Slack) render link previews at
+OG_IMAGE_SIZE = (1200, 630)
+FRAGMENTS_DIR = "fragments"
+# data.js of older builds, data.<hash>.js and their precompressed siblings; nothing else is ever deleted
+DATA_SCRIPT = re.compile(r"data(\.[0-9a-f]{12})?\.js(\.gz|\.br)?")
+FRAGMENT_CACHE_DIR = CACHE_DIR / "fragments"
+# Least recently used fragments are deleted beyond this size; the cache is shared by every profile
+FRAGMENT_CACHE_BYTES = 32 * 1024 * 1024
+
+
+def _tech(item: dict) -> list[str]:
+    tech = item.get("tech", [])
+    return tech.get("crypto", []) if isinstance(tech, dict) else tech
+
+
+def _job_view(index: int, job: dict) -> dict:
+    product = job.get("product")
+    return {
+        "id": f"job-{index}",
+        "highlight": index == 0,
+        "commit": COMMIT_HASHES[index % len(COMMIT_HASHES)],
+        "period": job.get("period", ""),
+        "title": job.get("titles", {}).get("portfolio", ""),
+        "company": job["company"],
+        "product": product if isinstance(product, str) else None,
+        "location": job.get("location", ""),
+        "bullets": [
+            bullet["text"]
+            for bullet in job.get("bullets", [])
+            if any(resume in bullet.get("resumes", []) for resume in PORTFOLIO_RESUMES)
+        ],
+        "tech": _tech(job),
+    }
+
+
+def _project_view(index: int, project: dict) -> dict:
+    return {
+        "id": f"project-{index}",
+        "title": project["title"],
+        "description": project["description"],
+        "metrics": project.get("metrics"),
+        "tech": _tech(project),
+        "github_url": project.get("github_url"),
+        "docs_url": project.get("docs_url"),
+    }
+
+
+def portfolio_view(data: dict) -> dict:
+    """What the template iterates over, filtered and flattened once: jobs with their portfolio bullets and tags,
+    the portfolio's skill categories, featured projects, education and languages.
+
+    The template only loops over these lists (and reads plain ``data`` fields); the
+    page's data script is cut from the same view.
+    """
+    personal = data["personal"]
+    github = personal["github"]
+    return {
+        "fname": personal["name"].replace(" ", "_"),
+        "resume_base": f"https://github.com/{github}/{github}/raw/main/output/",
+        "stats": data.get("stats", []),
+        "jobs": [_job_view(i, job) for i, job in enumerate(data["experience"])],
+        "skills": [
+            {"label": data["skills"][key]["label"], "items": data["skills"][key]["items"]}
+            for key in data["skills_by_resume"].get(PORTFOLIO_SKILLS, [])
+        ],
+        "projects": [
+            _project_view(i, project) for i, project in enumerate(data.get("projects", [])) if project.get("featured")
+        ],
+        "education": data["education"],
+        "languages": [(language.capitalize(), level) for language, level in data["languages"].items()],
+    }
+
+
+def tech_index(view: dict) -> dict:
+    """Inverted index: lower-cased tech tag -> its name, use count and the IDs of the jobs and projects showing it.
+
+    Tags are the ones the page renders (a job's or project's ``tech``, its crypto list when split),
+    so a lookup from the terminal or a filter is one dict access. Most used tags come first.
+    """
+    index = {}
+    for item in view["jobs"] + view["projects"]:
+        for name in item["tech"]:
+            entry = index.setdefault(name.lower(), {"name": name, "count": 0, "ids": []})
+            if entry["ids"][-1:] != [item["id"]]:
+                entry["ids"].append(item["id"])
+                entry["count"] += 1
+    return dict(sorted(index.items(), key=lambda item: (-item[1]["count"], item[0])))
+
+
+def script_data(data: dict, view: dict) -> dict:
+    """The part of the profile the page's terminal reads from ``window.PORTFOLIO_DATA``."""
+    personal = data["personal"]
+    return {
+        "personal": {key: personal.get(key, "") for key in PERSONAL_KEYS},
+        "title": data["titles"].get("portfolio", ""),
+        "summary": data["summaries"].get("portfolio", ""),
+        "experience": [
+            {key: job[key] or "" for key in ("id", "period", "title", "company", "product", "location")}
+            for job in view["jobs"]
+        ],
+        "skills": view["skills"],
+        "projects": [
+            {key: project[key] for key in ("id", "title", "description", "tech")} for project in view["projects"]
+        ],
+        "tech_index": tech_index(view),
+    }
+
+
+def _script_json(data: dict, view: dict) -> str:
+    # "</" would end an inline <script> early
+    encoded = json.dumps(script_data(data, view), ensure_ascii=False, separators=(",", ":"))
+    return encoded.replace("</", "<\\/")
+
+
+def data_script(data: dict, view: dict) -> tuple[str, bytes]:
+    """(file name, content) of the page's data script; the name carries a hash of the content."""
+    content = f"window.PORTFOLIO_DATA={_script_json(data, view)};\n".encode()
+    return f"data.{hashlib.sha256(content).hexdigest()[:12]}.js", content
+
+
+def optimized_og_image(ctx: BuildContext, site_dir: Path) -> str | None:
+    """URL of ``seo.og_image`` resized to ``OG_IMAGE_SIZE``, if it is a local file (or one in ``site_dir``)."""
+    seo = ctx.data["seo"]
+    reference = seo.get("og_image", "")
+    site = seo["json_ld"].get("url", "").rstrip("/")
+    if "://" not in reference:
+        source = ctx.root_dir / reference
+    elif site and reference.startswith(f"{site}/"):
+        source = site_dir / reference.removeprefix(f"{site}/")
+    else:
+        source = None
+    if not reference or source is None or not source.is_file():
+        print("· seo.og_image is not a local file - referenced as it is")
+        return None
+
+    from . import images  # noqa: PLC0415 - Pillow is only needed for this stage
+
+    with span("images.og_image"):
+        result = images.fit_still(source, site_dir / images.IMAGES_DIR, OG_IMAGE_SIZE)
+    if result is None:
+        print(images.SKIPPED)
+        return None
+    print(images.format_result(result, site_dir))
+    return "/".join(filter(None, [site, result.path.relative_to(site_dir).as_posix()]))
+
 
-SCRIPT_DIR = Path(__file__).parent
-ROOT_DIR = SCRIPT_DIR.parent.parent
-DATA_PATH = ROOT_DIR / "data.json"
-TEMPLATES_DIR = SCRIPT_DIR.parent / "templates"
-OUTPUT_DIR = ROOT_DIR / "output" / "portfolio"
+@lru_cache(maxsize=64)
+def _source_digest(path: Path, mtime_ns: int) -> str:  # noqa: ARG001 - part of the cache key
+    return hashlib.sha256(path.read_bytes()).hexdigest()
 
 
-def validate_data(data: dict) -> list[str]:
-    errors = []
-    required = ["personal", "meta", "skills", "experience", "education"]
-    for field in required:
-        if field not in data:
-            errors.append(f"Missing required field: {field}")
-    if "personal" in data:
-        for f in ["name", "email", "github"]:
-            if f not in data["personal"]:
-                errors.append(f"Missing personal.{f}")
-    return errors
+class FragmentCache:
+    """Renders the page's fragments, reusing earlier renders stored on disk when enabled.
 
+    Each fragment template defines one macro named after it, whose arguments are all the
+    data it can read; a fragment's key hashes its template source and the JSON of those
+    arguments. Caching is on with ``ctx.fragment_cache`` or an explicit ``cache_dir``;
+    otherwise every fragment is rendered, at the cost of rendering it inline. A hit
+    refreshes the entry's mtime, and a page that wrote new entries then deletes the
+    least recently used ones until the directory holds at most ``max_bytes``.
+    """
 
-def generate(output_dir: str = ""):
+    def __init__(
+        self,
+        ctx: BuildContext,
+        cache_dir: Path | None = None,
+        max_bytes: int = FRAGMENT_CACHE_BYTES,
+    ) -> None:
+        self.ctx = ctx
+        self.cache_dir = cache_dir or (FRAGMENT_CACHE_DIR if ctx.fragment_cache else None)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.pruned = 0
+        # Fragment name -> its macro and the digest of its source, looked up once per page
+        self._macros: dict[str, object] = {}
+        self._sources: dict[str, str] = {}
+
+    def render(self, name: str, **context: object) -> str:
+        """Fragment ``name`` rendered with ``context``, from the cache when possible."""
+        if self.cache_dir is None:
+            self.misses += 1
+            return self._render(name, context)
+
+        if name not in self._sources:
+            source = self.ctx.templates_dir / FRAGMENTS_DIR / f"{name}.html.j2"
+            self._sources[name] = _source_digest(source, source.stat().st_mtime_ns)
+        digest = hashlib.sha256(self._sources[name].encode())
+        digest.update(json.dumps(context, sort_keys=True, ensure_ascii=False).encode())
+        path = f"{self.cache_dir}/{name}.{digest.hexdigest()[:20]}.html"
+        try:
+            with open(path, encoding="utf-8") as file:
+                html = file.read()
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            html = self._render(name, context)
+            write_text_if_changed(Path(path), html)
+        else:
+            self.hits += 1
+        return html
+
+    def prune(self) -> int:
+        """Delete the least recently used entries beyond ``max_bytes``; returns how many were deleted."""
+        entries = []
+        with os.scandir(self.cache_dir) as scan:
+            for entry in scan:
+                if entry.name.endswith(".html") and entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        deleted = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            # Another process pruning the same directory may have deleted it already
+            Path(path).unlink(missing_ok=True)
+            total -= size
+            deleted += 1
+        return deleted
+
+    def _render(self, name: str, context: dict) -> str:
+        if name not in self._macros:
+            module = self.ctx.jinja_env.get_template(f"{FRAGMENTS_DIR}/{name}.html.j2").module
+            self._macros[name] = getattr(module, name)
+        return str(self._macros[name](**context))
+
+    def page(self, view: dict, og_image: str | None = None) -> dict:
+        """Every fragment of the page, as the page template includes them."""
+        data = self.ctx.data
+        with span("portfolio.fragments") as event_args:
+            fragments = {
+                "seo": self.render(
+                    "seo",
+                    meta=data["meta"],
+                    seo=data["seo"],
+                    og_image=og_image or data["seo"].get("og_image", ""),
+                ),
+                "header": self.render(
+                    "header",
+                    personal=data["personal"],
+                    title=data["titles"].get("portfolio", ""),
+                    fname=view["fname"],
+                    resume_base=view["resume_base"],
+                ),
+                "stats": self.render("stats", stats=view["stats"]),
+                "jobs": [self.render("job", job=job) for job in view["jobs"]],
+                "skills": self.render("skills", skills=view["skills"]),
+                "projects": [self.render("project", project=project) for project in view["projects"]],
+            }
+            if self.cache_dir is not None and self.misses:
+                self.pruned += self.prune()
+            event_args.update(hits=self.hits, misses=self.misses, pruned=self.pruned)
+        return fragments
+
+
+def render_html(
+    ctx: BuildContext,
+    data_js: str | None = None,
+    og_image: str | None = None,
+    *,
+    view: dict | None = None,
+    fragments: FragmentCache | None = None,
+) -> str:
+    """The page; its script data is loaded from ``data_js`` when given, inlined otherwise."""
+    if view is None:
+        with span("portfolio.view"):
+            view = portfolio_view(ctx.data)
+    fragments = fragments or FragmentCache(ctx)
+    page_fragments = fragments.page(view, og_image)
+    with span("jinja.load_template"):
+        template = ctx.jinja_env.get_template("portfolio.html.j2")
+    with span("jinja.render"):
+        portfolio_json = None if data_js else _script_json(ctx.data, view)
+        return template.render(
+            data=ctx.data,
+            view=view,
+            fragments=page_fragments,
+            data_js=data_js,
+            portfolio_json=portfolio_json,
+        )
+
+
+def render(ctx: BuildContext | None = None) -> bytes:
+    """The portfolio page as UTF-8 HTML (minified with ``optimize_assets``, CSS and script data kept inline)."""
+    ctx = ctx or BuildContext()
+    html = render_html(ctx)
+    if ctx.optimize_assets:
+        from .assets import minify_html  # noqa: PLC0415
+
+        html = minify_html(html)
+    return html.encode("utf-8")
+
+
+def generate(output_dir: str = "", ctx: BuildContext | None = None):
+    ctx = ctx or BuildContext()
     if not output_dir:
-        output_path = OUTPUT_DIR
+        output_path = ctx.portfolio_dir
     else:
         output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    # Load and validate
-    with open(DATA_PATH, encoding="utf-8") as f:
-        data = json.load(f)
+    ctx.check_schema()
 
-    errors = validate_data(data)
-    if errors:
-        print("⚠ Validation warnings:")
-        for e in errors:
-            print(f"  - {e}")
+    with span("portfolio.view"):
+        view = portfolio_view(ctx.data)
 
-    # Set up Jinja2
-    env = Environment(
-        loader=FileSystemLoader(str(TEMPLATES_DIR)),
-        autoescape=False,
-        keep_trailing_newline=True,
-    )
-    env.filters["tojson"] = lambda v, indent=None: json.dumps(v, indent=indent, ensure_ascii=False)
+    # Write data.<hash>.js; browsers may cache it forever, a data change renames it
+    data_js, content = data_script(ctx.data, view)
+    with span("write"):
+        write_if_changed(output_path / data_js, content)
+        for stale in output_path.glob("data*.js*"):
+            if DATA_SCRIPT.fullmatch(stale.name) and not stale.name.startswith(data_js):
+                stale.unlink()
+    print(f"✓ Wrote {data_js} ({len(content):,} B)")
+
+    og_image = optimized_og_image(ctx, output_path) if ctx.optimize_images else None
 
     # Render template
-    template = env.get_template("portfolio.html.j2")
-    html = template.render(data=data)
+    fragments = FragmentCache(ctx)
+    html = render_html(ctx, data_js, og_image, view=view, fragments=fragments)
+    rendered = len(html.encode("utf-8"))
+    if ctx.optimize_assets:
+        from . import assets  # noqa: PLC0415
+
+        with span("assets.minify"):
+            html = assets.optimize_page(html, output_path)
 
     # Write index.html
     index = output_path / "index.html"
-    index.write_text(html, encoding="utf-8")
-    print(f"✓ Rendered portfolio → {index}")
+    with span("write"):
+        changed = write_text_if_changed(index, html)
+    cached = ""
+    if fragments.cache_dir is not None:
+        cached = f" (fragments: {fragments.misses} rendered, {fragments.hits} cached)"
+    print(f"✓ Rendered portfolio → {index}{'' if changed else ' (unchanged)'}{cached}")
 
-    # Update sitemap.xml lastmod
+    # Bump sitemap.xml lastmod only when the page content changed
     sitemap = output_path / "sitemap.xml"
     if sitemap.exists():
         today = date.today().isoformat()
         sitemap_content = sitemap.read_text(encoding="utf-8")
-        if "<lastmod>" in sitemap_content:
+        if "<lastmod>" not in sitemap_content:
+            sitemap_content = sitemap_content.replace(
+                "<changefreq>",
+                f"<lastmod>{today}</lastmod>\n    <changefreq>",
+            )
+        elif changed:
             sitemap_content = re.sub(
                 r"<lastmod>[^<]+</lastmod>",
                 f"<lastmod>{today}</lastmod>",
                 sitemap_content,
             )
-        else:
-            sitemap_content = sitemap_content.replace(
-                "<changefreq>",
-                f"<lastmod>{today}</lastmod>\n    <changefreq>",
-            )
-        sitemap.write_text(sitemap_content, encoding="utf-8")
-        print(f"✓ Updated sitemap.xml lastmod → {today}")
+        if write_text_if_changed(sitemap, sitemap_content):
+            print(f"✓ Updated sitemap.xml lastmod → {today}")
+
+    if ctx.optimize_assets:
+        with span("assets.precompress"):
+            sizes = assets.precompress(output_path)
+        print(assets.format_report(rendered, sizes, output_path))
+    elif (output_path / "index.html.gz").exists() or (output_path / "_headers").exists():
+        from . import assets  # noqa: PLC0415
+
+        # Siblings of an earlier --optimize-assets build would be served instead of the new files
+        removed = assets.remove_optimized(output_path)
+        print(f"✓ Removed {len(removed)} files of an earlier --optimize-assets build")
 
     print(f"✓ Portfolio ready: {output_path}")
     return str(output_path)
@@ -1,10 +1,18 @@
 #!/usr/bin/env python3
 
-from .shared import load_data
+import os
+from pathlib import Path
 
+from .context import BuildContext
+from .outputs import write_if_changed
+from .profiling import span, traced
 
-def generate(output_path: str = "README.md"):
-    data = load_data()
+# Animation at the top of the profile README, relative to the repository root
+BANNER = "game.gif"
+
+
+@traced("markdown")
+def render_readme(data: dict, banner: str = BANNER) -> str:
     personal = data.get("personal", {})
     social = data.get("social", {})
     readme = data.get("readme", {})
@@ -28,7 +36,7 @@ def generate(output_path: str = "README.md"):
 
     highlights_md = "\n".join(f"- {h}" for h in highlights)
 
-    content = f"""![](game.gif)
+    content = f"""![]({banner})
 
 ### {name}
 
@@ -46,11 +54,39 @@ def generate(output_path: str = "README.md"):
 
     if cta:
         content = content.rstrip("\n") + f"\n\n> {cta}\n"
+    return content
+
+
+def render(ctx: BuildContext | None = None) -> bytes:
+    """The README as UTF-8 Markdown."""
+    return render_readme((ctx or BuildContext()).data).encode("utf-8")
+
+
+def banner_path(ctx: BuildContext, readme_dir: Path) -> str:
+    """The README animation relative to ``readme_dir``; its optimized copy with ``optimize_images``."""
+    if not ctx.optimize_images:
+        return BANNER
+    from . import images  # noqa: PLC0415 - Pillow is only needed for this stage
+
+    with span("images.animation"):
+        budget = ctx.image_budget or images.DEFAULT_BUDGET
+        result = images.fit_animation(ctx.root_dir / BANNER, ctx.output_dir / images.IMAGES_DIR, budget)
+    if result is None:
+        print(images.SKIPPED)
+        return BANNER
+    print(images.format_result(result, ctx.root_dir))
+    return Path(os.path.relpath(result.path, readme_dir)).as_posix()
+
+
+def generate(output_path: str = "README.md", ctx: BuildContext | None = None):
+    ctx = ctx or BuildContext()
+    banner = banner_path(ctx, Path(output_path).absolute().parent)
+    content = render_readme(ctx.data, banner).encode("utf-8")
 
-    with open(output_path, "w", encoding="utf-8") as file:
-        file.write(content)
+    with span("write"):
+        written = write_if_changed(output_path, content)
 
-    print(f"README generated: {output_path}")
+    print(f"README generated: {output_path}{'' if written else ' (unchanged)'}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Render one resume variant declared under ``variants`` in data.json to PDF."""
+
+import io
+import sys
+
+from .context import BuildContext
+from .outputs import write_if_changed
+from .profiling import span, traced
+from .shared import (
+    add_education,
+    add_experience,
+    add_header,
+    add_languages,
+    add_leadership_section,
+    add_skills,
+    add_summary,
+    make_doc,
+    measure_pages,
+)
+
+# Page fitting never trims a job below this many bullets
+MIN_BULLETS = 1
+
+
+@traced("story")
+def build_story(ctx: BuildContext, variant: str, max_bullets: int | list[int] | None = None) -> list:
+    data = ctx.data
+    resume = ctx.variants[variant]
+    styles = ctx.styles(variant)
+    story = []
+
+    add_header(story, data, variant, styles)
+    add_summary(story, data, variant, styles)
+    add_skills(story, data, resume.skill_keys, styles)
+    add_experience(story, resume, styles, max_bullets)
+    if resume.leadership:
+        add_leadership_section(story, data, styles)
+    add_education(story, data, styles)
+    add_languages(story, data, styles)
+    return story
+
+
+def _with_limits(story: list, limits: list[int]) -> list:
+    return [
+        flowable
+        for flowable in story
+        if not hasattr(flowable, "resume_bullet") or flowable.resume_bullet[1] < limits[flowable.resume_bullet[0]]
+    ]
+
+
+@traced("fit_pages")
+def fit_story(ctx: BuildContext, variant: str, max_pages: int) -> tuple[list, list[int] | None, int]:
+    """Story trimmed to ``max_pages``, with its per-job bullet limits (None if nothing was cut) and page count.
+
+    If even ``MIN_BULLETS`` per job does not fit, the untrimmed story is returned with its
+    page count, which exceeds ``max_pages``: cutting would not meet the budget anyway.
+    The full story is built once; candidate limits are measured with ``measure_pages``
+    instead of building PDFs. The largest uniform limit that fits is found by binary
+    search, then jobs get bullets back in order, most recent first, while they still fit.
+    """
+    story = build_story(ctx, variant)
+    doc = make_doc(io.BytesIO())
+    heights = {}
+
+    def pages(limits: list[int]) -> int:
+        return measure_pages(_with_limits(story, limits), doc, heights)
+
+    counts = [len(job.bullets) for job in ctx.variants[variant].jobs]
+    measured = pages(counts)
+    if measured <= max_pages or not counts:
+        return story, None, measured
+
+    def uniform(cap: int) -> list[int]:
+        return [min(count, cap) for count in counts]
+
+    low, high = MIN_BULLETS, max(counts)
+    if pages(uniform(low)) > max_pages:
+        return story, None, measured
+    while low < high:
+        middle = (low + high + 1) // 2
+        if pages(uniform(middle)) <= max_pages:
+            low = middle
+        else:
+            high = middle - 1
+
+    limits = uniform(low)
+    for index, count in enumerate(counts):
+        while limits[index] < count:
+            limits[index] += 1
+            if pages(limits) > max_pages:
+                limits[index] -= 1
+                break
+    return _with_limits(story, limits), limits, pages(limits)
+
+
+def _story(ctx: BuildContext, variant: str) -> list:
+    if not ctx.max_pages:
+        return build_story(ctx, variant)
+    story, limits, pages = fit_story(ctx, variant, ctx.max_pages)
+    budget = f"{ctx.max_pages} page{'s' * (ctx.max_pages != 1)}"
+    if pages > ctx.max_pages:
+        msg = f"{variant} cannot fit {budget}: {pages} pages even with {MIN_BULLETS} bullet(s) per job"
+        raise ValueError(msg)
+    if limits:
+        counts = [len(job.bullets) for job in ctx.variants[variant].jobs]
+        kept = ", ".join(f"{limit}/{count}" for limit, count in zip(limits, counts, strict=True))
+        print(f"· fitted to {budget} ({variant}): bullets per job {kept}")
+    return story
+
+
+def render(ctx: BuildContext | None = None, variant: str = "backend_crypto") -> bytes:
+    """The variant's PDF, built in memory (trimmed to ``ctx.max_pages`` when set; ValueError if it cannot fit)."""
+    ctx = ctx or BuildContext()
+    buffer = io.BytesIO()
+    make_doc(buffer).build(_story(ctx, variant))
+    return buffer.getvalue()
+
+
+def generate(output_path: str = "", ctx: BuildContext | None = None, variant: str = "backend_crypto"):
+    ctx = ctx or BuildContext()
+    ctx.check_schema()
+    output_path = output_path or f"{ctx.file_prefix}_Resume_{ctx.variants[variant].file_suffix}.pdf"
+    pdf = render(ctx, variant)
+    with span("write"):
+        written = write_if_changed(output_path, pdf)
+    print(f"Resume ({variant}): {output_path}{'' if written else ' (unchanged)'}")
+
+
+if __name__ == "__main__":
+    generate(variant=sys.argv[1] if len(sys.argv) > 1 else "backend_crypto")
@@ -0,0 +1,163 @@
+"""Optional image stage (Pillow): animations within a byte budget, resized portfolio images.
+
+Animated GIFs are re-encoded along a ladder of increasingly lossy attempts - optimized
+GIF, then lossless animated WebP, first at full size with every frame, then dropping
+frames (their time goes to the frame kept before them) and scaling down - until one
+fits the budget; if none does, the smallest is kept. Still images are cropped and
+resized to a fixed size. Results are named ``<stem>.<hash>.<ext>``, where the hash
+covers the source bytes and every encoding parameter, so an unchanged source is never
+re-encoded and a changed one gets a new, cacheable name. Without Pillow (the
+``images`` extra) the stage reports itself skipped and sources are referenced as-is.
+"""
+
+import hashlib
+import io
+import re
+from pathlib import Path
+from typing import NamedTuple
+
+from .outputs import write_if_changed
+
+IMAGES_DIR = "images"
+DEFAULT_BUDGET = 1024 * 1024
+# (scale, keep every n-th frame), from the most to the least faithful
+ANIMATION_LADDER = ((1.0, 1), (1.0, 2), (0.75, 2), (0.5, 2), (0.5, 3))
+ANIMATION_FORMATS = ("GIF", "WEBP")
+# Bump when the encoders change, so cached results are not reused
+STAGE_VERSION = 1
+SKIPPED = "· Pillow not installed - images referenced as they are (install the `images` extra)"
+
+
+class OptimizedImage(NamedTuple):
+    source: Path
+    path: Path
+    source_bytes: int
+    bytes: int
+    note: str
+
+
+def _pillow():
+    try:
+        import PIL.Image  # noqa: PLC0415 - optional dependency
+    except ImportError:
+        return None
+    return PIL
+
+
+def _key(data: bytes, *params: object) -> str:
+    digest = hashlib.sha256(data)
+    digest.update(repr((STAGE_VERSION, *params)).encode())
+    return digest.hexdigest()[:12]
+
+
+def _cached(output_dir: Path, source: Path, key: str) -> Path | None:
+    return next(output_dir.glob(f"{source.stem}.{key}.*"), None)
+
+
+def _publish(output_dir: Path, source: Path, key: str, suffix: str, content: bytes) -> Path:
+    """Write the result and remove results of older versions of the same source."""
+    path = output_dir / f"{source.stem}.{key}{suffix}"
+    write_if_changed(path, content)
+    result = re.compile(rf"{re.escape(source.stem)}\.[0-9a-f]{{12}}\.\w+")
+    for stale in output_dir.glob(f"{source.stem}.*"):
+        if stale != path and result.fullmatch(stale.name):
+            stale.unlink()
+    return path
+
+
+def _frames(image) -> tuple[list, list[int]]:
+    from PIL import ImageSequence  # noqa: PLC0415
+
+    frames, durations = [], []
+    for frame in ImageSequence.Iterator(image):
+        frames.append(frame.convert("RGBA"))
+        durations.append(frame.info.get("duration", image.info.get("duration", 100)))
+    return frames, durations
+
+
+def _encode_animation(frames: list, durations: list[int], fmt: str, *, scale: float, step: int, loop: int) -> bytes:
+    from PIL import Image  # noqa: PLC0415
+
+    kept = frames[::step]
+    timing = [sum(durations[i : i + step]) for i in range(0, len(durations), step)]
+    if scale != 1.0:
+        width, height = kept[0].size
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        kept = [frame.resize(size, Image.Resampling.LANCZOS) for frame in kept]
+    if fmt == "GIF":
+        kept = [frame.convert("RGB").quantize(colors=256, method=Image.Quantize.FASTOCTREE) for frame in kept]
+        options = {"optimize": True, "disposal": 1}
+    else:
+        options = {"lossless": True, "method": 4}
+    buffer = io.BytesIO()
+    kept[0].save(buffer, format=fmt, save_all=True, append_images=kept[1:], duration=timing, loop=loop, **options)
+    return buffer.getvalue()
+
+
+def fit_animation(source: Path, output_dir: Path, budget: int = DEFAULT_BUDGET) -> OptimizedImage | None:
+    """Re-encode an animated GIF to at most ``budget`` bytes if possible; None without Pillow."""
+    pil = _pillow()
+    if pil is None:
+        return None
+    data = source.read_bytes()
+    key = _key(data, budget, ANIMATION_LADDER, ANIMATION_FORMATS)
+    cached = _cached(output_dir, source, key)
+    if cached:
+        return OptimizedImage(source, cached, len(data), cached.stat().st_size, "cached")
+
+    image = pil.Image.open(io.BytesIO(data))
+    frames, durations = _frames(image)
+    loop = image.info.get("loop", 0)
+    best = None
+    for scale, step in ANIMATION_LADDER:
+        for fmt in ANIMATION_FORMATS:
+            encoded = _encode_animation(frames, durations, fmt, scale=scale, step=step, loop=loop)
+            note = f"{fmt} at {scale:.0%}" + (f", 1 frame in {step}" if step > 1 else "")
+            if best is None or len(encoded) < len(best[0]):
+                best = (encoded, fmt, note)
+            if len(encoded) <= budget:
+                break
+        if len(best[0]) <= budget:
+            break
+
+    encoded, fmt, note = best
+    if len(encoded) > budget:
+        note = f"{note}; over the {budget:,} B budget"
+    # An animation already smaller than anything we can produce is kept as it is
+    if len(data) <= len(encoded):
+        encoded, fmt, note = data, "GIF", "original"
+    path = _publish(output_dir, source, key, f".{fmt.lower()}", encoded)
+    return OptimizedImage(source, path, len(data), len(encoded), note)
+
+
+def fit_still(source: Path, output_dir: Path, size: tuple[int, int]) -> OptimizedImage | None:
+    """``source`` cropped to ``size``'s aspect ratio and resized to it; None without Pillow."""
+    pil = _pillow()
+    if pil is None:
+        return None
+    from PIL import ImageOps  # noqa: PLC0415
+
+    data = source.read_bytes()
+    key = _key(data, size)
+    cached = _cached(output_dir, source, key)
+    if cached:
+        return OptimizedImage(source, cached, len(data), cached.stat().st_size, "cached")
+
+    image = ImageOps.fit(pil.Image.open(io.BytesIO(data)), size, pil.Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    if image.mode in {"RGBA", "LA", "P"}:
+        image.save(buffer, format="PNG", optimize=True)
+        suffix = ".png"
+    else:
+        image.convert("RGB").save(buffer, format="JPEG", quality=85, optimize=True, progressive=True)
+        suffix = ".jpg"
+    path = _publish(output_dir, source, key, suffix, buffer.getvalue())
+    return OptimizedImage(source, path, len(data), path.stat().st_size, f"{size[0]}x{size[1]}")
+
+
+def format_result(result: OptimizedImage, base_dir: Path) -> str:
+    marker = "⚠" if "budget" in result.note else "✓"
+    return (
+        f"{marker} {result.source.name} {result.source_bytes:,} B → "
+        f"{result.path.relative_to(base_dir).as_posix()} {result.bytes:,} B ({result.note})"
+    )
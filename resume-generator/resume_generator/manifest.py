@@ -0,0 +1,70 @@
+"""Build manifest: content hashes of every target's inputs and outputs.
+
+A target is up to date when the hashes of the data.json subtrees it reads, the
+source files it depends on and the files it produced all match the previous run.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from .outputs import write_text_if_changed
+
+MANIFEST_NAME = ".build-manifest.json"
+MANIFEST_VERSION = 1
+
+_MISSING = object()
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: Path) -> str | None:
+    try:
+        return hash_bytes(path.read_bytes())
+    except FileNotFoundError:
+        return None
+
+
+def hash_subtree(data: dict, key_path: str) -> str | None:
+    """Hash the value at a dotted path such as ``titles.cto`` (``None`` if absent)."""
+    node = data
+    for key in key_path.split("."):
+        node = node.get(key, _MISSING) if isinstance(node, dict) else _MISSING
+        if node is _MISSING:
+            return None
+    encoded = json.dumps(node, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hash_bytes(encoded.encode("utf-8"))
+
+
+def input_hashes(data: dict, data_keys, sources, base_dir: Path) -> dict:
+    return {
+        "data": {key: hash_subtree(data, key) for key in data_keys},
+        "sources": {str(path.relative_to(base_dir)): hash_file(path) for path in sources},
+    }
+
+
+def output_hashes(artifacts, base_dir: Path) -> dict:
+    return {str(path.relative_to(base_dir)): hash_file(path) for path in artifacts}
+
+
+def load_manifest(path: Path) -> dict:
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"version": MANIFEST_VERSION, "targets": {}}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {"version": MANIFEST_VERSION, "targets": {}}
+    return manifest
+
+
+def save_manifest(path: Path, manifest: dict):
+    write_text_if_changed(path, json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+
+
+def is_fresh(entry: dict | None, inputs: dict, outputs: dict) -> bool:
+    """Whether a recorded target still matches its current inputs and on-disk outputs."""
+    if not entry or entry.get("inputs") != inputs:
+        return False
+    return all(digest is not None for digest in outputs.values()) and entry.get("outputs") == outputs
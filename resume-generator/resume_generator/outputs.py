@@ -0,0 +1,43 @@
+"""Writing generated files: atomically, and only when their bytes change.
+
+An unchanged output keeps its content and mtime, so git sees nothing to commit and
+the Pages workflow, CDN purges and downstream builds are not triggered. A changed
+output is written to a temporary file next to it and renamed over the old one, so
+a reader (the watch server, a concurrent build, a crashed run) never sees half a file.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+DEFAULT_MODE = 0o644
+
+
+def write_if_changed(path: Path, content: bytes) -> bool:
+    """Atomically replace ``path`` with ``content`` unless it already holds these bytes; returns whether it wrote."""
+    path = Path(path)
+    try:
+        stat = path.stat()
+        if stat.st_size == len(content) and path.read_bytes() == content:
+            return False
+        mode = stat.st_mode & 0o777
+    except FileNotFoundError:
+        mode = DEFAULT_MODE
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    temp = Path(name)
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(content)
+        temp.chmod(mode)
+        temp.replace(path)
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+    return True
+
+
+def write_text_if_changed(path: Path, text: str) -> bool:
+    """:func:`write_if_changed` for UTF-8 text."""
+    return write_if_changed(path, text.encode("utf-8"))
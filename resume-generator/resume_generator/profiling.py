@@ -0,0 +1,105 @@
+"""Span tracing for ``generate-resume --profile``.
+
+Generators and ``shared.py`` mark their stages with :func:`span` / :func:`traced`.
+Spans are only recorded between :func:`enable` and :func:`disable`; otherwise a
+hook costs one global lookup. Recorded events use the Chrome trace-event format,
+so ``trace.json`` opens directly in ``chrome://tracing`` or Perfetto.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+
+_events: list[dict] | None = None
+
+
+def enable():
+    global _events  # noqa: PLW0603
+    _events = []
+
+
+def is_enabled() -> bool:
+    return _events is not None
+
+
+def record(events: list[dict]):
+    """Merge events recorded elsewhere (e.g. in a worker process) into the active recording."""
+    if _events is not None:
+        _events.extend(events)
+
+
+def disable() -> list[dict]:
+    """Stop recording and return the events collected since :func:`enable`."""
+    global _events
+    events, _events = _events or [], None
+    return events
+
+
+@contextmanager
+def span(name: str, category: str = "stage"):
+    """Record a complete ("X") event around the block; yields a dict for extra event args."""
+    if _events is None:
+        yield {}
+        return
+    args = {}
+    start = time.perf_counter_ns()
+    try:
+        yield args
+    finally:
+        _events.append(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": start / 1000,
+                "dur": (time.perf_counter_ns() - start) / 1000,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": args,
+            },
+        )
+
+
+def traced(name: str, category: str = "stage"):
+    """Decorator form of :func:`span`."""
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args: object, **kwargs: object):
+            with span(name, category):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def write_chrome_trace(path: Path, events: list[dict]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    trace = {"traceEvents": sorted(events, key=lambda e: e["ts"]), "displayTimeUnit": "ms"}
+    path.write_text(json.dumps(trace) + "\n", encoding="utf-8")
+
+
+def summary(events: list[dict]) -> str:
+    """Per-target table of nested stage totals (ms), plus the target's tracemalloc peak if recorded."""
+    targets = sorted((e for e in events if e["cat"] == "target"), key=lambda e: e["ts"])
+    lines = [f"{'target / stage':<36}{'calls':>7}{'total ms':>12}{'peak KiB':>11}"]
+    for target in targets:
+        end = target["ts"] + target["dur"]
+        peak = target["args"].get("peak_kib", "")
+        lines.append(f"{target['name']:<36}{1:>7}{target['dur'] / 1000:>12.2f}{peak:>11}")
+
+        stages = defaultdict(lambda: [0, 0.0])
+        for event in events:
+            inside = event["pid"] == target["pid"] and target["ts"] <= event["ts"] < end
+            if inside and event is not target and event["cat"] != "target":
+                stages[event["name"]][0] += 1
+                stages[event["name"]][1] += event["dur"]
+        for name, (calls, total) in sorted(stages.items(), key=lambda item: -item[1][1]):
+            lines.append(f"  {name:<34}{calls:>7}{total / 1000:>12.2f}")
+    return "\n".join(lines)
@@ -0,0 +1,344 @@
+"""Schema for data.json, compiled once into a validator that reports every error in one pass.
+
+The schema uses a small JSON Schema subset (``type``, ``properties``, ``required``,
+``additionalProperties``, ``items``, ``enum``, ``minLength``); :func:`compile_schema`
+turns it into nested closures, so validating a profile walks it exactly once
+without re-interpreting the schema. Errors are reported with JSONPath-style paths,
+e.g. ``$.experience[2].bullets[0].resumes[1]``. References between sections
+(variant names, skill keys) are checked after the structure.
+"""
+
+from collections.abc import Callable
+from fnmatch import fnmatchcase
+from functools import cache
+
+Validator = Callable[[object, str, list[str]], None]
+
+STRING = {"type": "string"}
+TEXT = {"type": "string", "minLength": 1}
+STRINGS = {"type": "array", "items": STRING}
+STRING_MAP = {"type": "object", "additionalProperties": STRING}
+INTEGER = {"type": "integer"}
+
+SCHEMA = {
+    "type": "object",
+    "required": [
+        "personal",
+        "titles",
+        "summaries",
+        "skills",
+        "skills_by_resume",
+        "experience",
+        "education",
+        "languages",
+        "linkedin",
+        # Read unconditionally by the portfolio template
+        "meta",
+        "seo",
+        "analytics",
+    ],
+    "properties": {
+        "personal": {
+            "type": "object",
+            "required": ["name", "email", "github", "linkedin", "telegram", "location", "hiring_notice"],
+            "properties": {
+                "name": TEXT,
+                "email": TEXT,
+                "phone": STRING,
+                "telegram": STRING,
+                "github": TEXT,
+                "linkedin": STRING,
+                "location": STRING,
+                "open_to": STRING,
+                "hiring_notice": STRING,
+                "avatar": STRING,
+                "tagline": STRING,
+            },
+        },
+        "meta": {"type": "object", "properties": {"title": STRING, "description": STRING, "keywords": STRING}},
+        "seo": {
+            "type": "object",
+            "required": ["json_ld"],
+            "properties": {"title": STRING, "description": STRING, "og_image": STRING, "json_ld": {"type": "object"}},
+        },
+        "titles": STRING_MAP,
+        "summaries": STRING_MAP,
+        "stats": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["value", "label"],
+                "properties": {"value": {"type": ["integer", "number", "string"]}, "suffix": STRING, "label": STRING},
+            },
+        },
+        "readme": {
+            "type": "object",
+            "properties": {
+                "subtitle": STRING,
+                "currently": STRING,
+                "highlights": STRINGS,
+                "stack": STRING,
+                "cta": STRING,
+            },
+        },
+        "skills": {
+            "type": "object",
+            "additionalProperties": {
+                "type": "object",
+                "required": ["label", "items"],
+                "properties": {"label": STRING, "items": STRINGS},
+            },
+        },
+        "skills_by_resume": {"type": "object", "additionalProperties": STRINGS},
+        "variants": {
+            "type": "object",
+            "additionalProperties": {
+                "type": "object",
+                "properties": {
+                    "title_variant": TEXT,
+                    "file_suffix": TEXT,
+                    "traditional": {"type": "boolean"},
+                    "leadership": {"type": "boolean"},
+                },
+            },
+        },
+        "experience": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["company"],
+                "properties": {
+                    "company": TEXT,
+                    "product": STRING,
+                    "product_sanitized": STRING,
+                    "period": STRING,
+                    "location": STRING,
+                    "location_sanitized": STRING,
+                    "title": STRING,
+                    "titles": STRING_MAP,
+                    "bullets": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "required": ["text"],
+                            "properties": {
+                                "text": TEXT,
+                                "sanitized": STRING,
+                                "audience": {"enum": ["both", "crypto", "traditional"]},
+                                "focus": {"enum": ["both", "ic", "leadership"]},
+                                "resumes": STRINGS,
+                            },
+                        },
+                    },
+                    # Either one list, or separate lists for crypto and traditional variants
+                    "tech": {
+                        "type": ["array", "object"],
+                        "items": STRING,
+                        "properties": {"crypto": STRINGS, "traditional": STRINGS},
+                    },
+                    "linkedin_skills": STRINGS,
+                    "color": STRING,
+                    "turnaround_narrative": STRING,
+                    "lessons_learned": STRINGS,
+                },
+            },
+        },
+        "projects": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["title", "description"],
+                "properties": {
+                    "icon": STRING,
+                    "title": TEXT,
+                    "title_sanitized": STRING,
+                    "description": STRING,
+                    "description_sanitized": STRING,
+                    "metrics": {
+                        "type": "array",
+                        "items": {"type": "object", "properties": {"label": STRING, "value": STRING}},
+                    },
+                    "tech": STRINGS,
+                    "tech_sanitized": STRINGS,
+                    "featured": {"type": "boolean"},
+                    "color": STRING,
+                    "github_url": STRING,
+                    "docs_url": STRING,
+                },
+            },
+        },
+        "education": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["title", "institution", "status"],
+                "properties": {"title": TEXT, "institution": STRING, "status": STRING},
+            },
+        },
+        "languages": {"type": "object", "required": ["russian", "english"], "additionalProperties": STRING},
+        "social": STRING_MAP,
+        "linkedin": {
+            "type": "object",
+            "required": ["headline", "about", "cta"],
+            "properties": {"headline": STRING, "about": STRING, "cta": STRING},
+        },
+        "analytics": {
+            "type": "object",
+            "required": ["yandex_metrika_id"],
+            "properties": {"yandex_metrika_id": {"type": ["integer", "string"]}},
+        },
+        "budgets": {
+            "type": "object",
+            "properties": {
+                # Variant name or fnmatch pattern -> most pages of its PDF
+                "pages": {"type": "object", "additionalProperties": INTEGER},
+                # Glob pattern relative to the repository root -> size limits
+                "artifacts": {
+                    "type": "object",
+                    "additionalProperties": {
+                        "type": "object",
+                        "properties": {"bytes": INTEGER, "gzip_bytes": INTEGER},
+                    },
+                },
+            },
+        },
+    },
+}
+
+_TYPES = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "boolean": lambda v: isinstance(v, bool),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, int | float) and not isinstance(v, bool),
+}
+
+
+def compile_schema(schema: dict) -> Validator:
+    """Turn a schema into ``validate(value, path, errors)``, appending ``"<path>: <problem>"`` strings."""
+    checks: list[Validator] = []
+
+    types = schema.get("type")
+    if types:
+        types = [types] if isinstance(types, str) else types
+        predicates = [_TYPES[t] for t in types]
+        expected = " or ".join(types)
+    else:
+        predicates = []
+
+    if "enum" in schema:
+        allowed = schema["enum"]
+
+        def check_enum(value, path, errors):
+            if value not in allowed:
+                errors.append(f"{path}: {value!r} is not one of {', '.join(map(repr, allowed))}")
+
+        checks.append(check_enum)
+
+    if "minLength" in schema:
+        min_length = schema["minLength"]
+
+        def check_length(value, path, errors):
+            if isinstance(value, str) and len(value) < min_length:
+                errors.append(f"{path}: must not be empty" if min_length == 1 else f"{path}: shorter than {min_length}")
+
+        checks.append(check_length)
+
+    required = schema.get("required", [])
+    properties = {key: compile_schema(sub) for key, sub in schema.get("properties", {}).items()}
+    extra = compile_schema(schema["additionalProperties"]) if "additionalProperties" in schema else None
+    if required or properties or extra:
+
+        def check_object(value, path, errors):
+            if not isinstance(value, dict):
+                return
+            for key in required:
+                if key not in value:
+                    errors.append(f"{path}: missing required key {key!r}")
+            for key, item in value.items():
+                validate = properties.get(key, extra)
+                if validate:
+                    validate(item, f"{path}.{key}", errors)
+
+        checks.append(check_object)
+
+    if "items" in schema:
+        validate_item = compile_schema(schema["items"])
+
+        def check_array(value, path, errors):
+            if isinstance(value, list):
+                for index, item in enumerate(value):
+                    validate_item(item, f"{path}[{index}]", errors)
+
+        checks.append(check_array)
+
+    def validate(value, path, errors):
+        if predicates and not any(predicate(value) for predicate in predicates):
+            errors.append(f"{path}: expected {expected}, got {type(value).__name__}")
+            return
+        for check in checks:
+            check(value, path, errors)
+
+    return validate
+
+
+@cache
+def _validator() -> Validator:
+    return compile_schema(SCHEMA)
+
+
+def _mapping(value: object) -> dict:
+    return value if isinstance(value, dict) else {}
+
+
+def _check_references(data: dict, errors: list[str]):
+    """Cross-section references the generators rely on; shape errors are left to the schema."""
+    variants = _mapping(data.get("variants"))
+    skills = _mapping(data.get("skills"))
+    for name in variants:
+        for section in ("titles", "summaries"):
+            if section in data and name not in _mapping(data[section]):
+                errors.append(f"$.{section}: missing entry for variant {name!r}")
+    for name, keys in _mapping(data.get("skills_by_resume")).items():
+        if variants and name not in variants:
+            errors.append(f"$.skills_by_resume.{name}: no such variant")
+        for index, key in enumerate(keys if isinstance(keys, list) else []):
+            if isinstance(key, str) and key not in skills:
+                errors.append(f"$.skills_by_resume.{name}[{index}]: unknown skill category {key!r}")
+    for pattern in _mapping(_mapping(data.get("budgets")).get("pages")):
+        if variants and not any(fnmatchcase(name, pattern) for name in variants):
+            errors.append(f"$.budgets.pages.{pattern}: matches no variant")
+    experience = data.get("experience")
+    for job_index, job in enumerate(experience if isinstance(experience, list) else []):
+        bullets = _mapping(job).get("bullets")
+        for bullet_index, bullet in enumerate(bullets if isinstance(bullets, list) else []):
+            resumes = _mapping(bullet).get("resumes")
+            for index, resume in enumerate(resumes if isinstance(resumes, list) else []):
+                if variants and isinstance(resume, str) and resume not in variants:
+                    path = f"$.experience[{job_index}].bullets[{bullet_index}].resumes[{index}]"
+                    errors.append(f"{path}: unknown variant {resume!r}")
+
+
+def validate(data: object) -> list[str]:
+    """Every schema and reference error in the profile, in document order."""
+    errors = []
+    _validator()(data, "$", errors)
+    if isinstance(data, dict):
+        _check_references(data, errors)
+    return errors
+
+
+class ValidationError(ValueError):
+    """A profile that does not match the schema; ``errors`` lists every problem."""
+
+    def __init__(self, errors: list[str], source: str = "profile") -> None:
+        super().__init__(f"{source} is invalid ({len(errors)} errors):\n" + "\n".join(f"  - {e}" for e in errors))
+        self.errors = errors
+
+
+def check(data: object, source: str = "profile"):
+    """Raise :class:`ValidationError` listing every problem if ``data`` is not a valid profile."""
+    errors = validate(data)
+    if errors:
+        raise ValidationError(errors, source)
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""Local HTTP service that renders resumes on demand.
+
+``POST /render/<target>`` with a profile JSON body (shaped like data.json) returns
+the rendered artifact; ``GET /render/<target>`` renders data.json itself. A target
+is a variant declared under ``variants`` (PDF), ``portfolio`` (HTML), ``readme`` or
+``linkedin`` (Markdown). Results are kept in a size-bounded LRU cache keyed by a
+hash of the canonical profile JSON and the target. ``GET /metrics`` reports the
+cache hit rate and request latencies.
+"""
+
+import argparse
+import hashlib
+import json
+import statistics
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib import import_module
+
+from .context import BuildContext
+
+DEFAULT_PORT = 8080
+DEFAULT_CACHE_MB = 64
+MAX_BODY_BYTES = 1024 * 1024
+LATENCY_WINDOW = 1000
+
+# Non-PDF targets -> (generator module, content type)
+TEXT_TARGETS = {
+    "portfolio": ("generate_portfolio", "text/html; charset=utf-8"),
+    "readme": ("generate_readme", "text/markdown; charset=utf-8"),
+    "linkedin": ("generate_linkedin", "text/markdown; charset=utf-8"),
+}
+
+
+class RenderError(Exception):
+    """A request that cannot be rendered; carries the HTTP status to answer with."""
+
+    def __init__(self, status: HTTPStatus, message: str, errors: list[str] | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.errors = errors or []
+
+
+class RenderCache:
+    """Thread-safe LRU cache of rendered artifacts, bounded by their total size in bytes."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[bytes, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> tuple[bytes, str] | None:
+        """Cached (body, content type), marked most recently used; None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, body: bytes, content_type: str):
+        """Store an artifact, evicting least recently used ones until the cache fits its bound."""
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous:
+                self.size -= len(previous[0])
+            self._entries[key] = (body, content_type)
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def stats(self) -> dict:
+        """Entry count, size and hit rate."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+class Renderer:
+    """Renders targets for arbitrary profiles, sharing styles and templates between requests."""
+
+    def __init__(self, cache: RenderCache) -> None:
+        self.cache = cache
+        self._default = BuildContext()
+        # ReportLab keeps module-level state, so renders run one at a time
+        self._render_lock = threading.Lock()
+        self._latencies = {"hit": deque(maxlen=LATENCY_WINDOW), "miss": deque(maxlen=LATENCY_WINDOW)}
+
+    def render(self, target: str, profile: dict | None = None) -> tuple[bytes, str, bool]:
+        """(body, content type, cache hit) for ``target`` rendered from ``profile`` (data.json if None)."""
+        start = time.perf_counter()
+        data = self._default.data if profile is None else profile
+        canonical = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        key = hashlib.sha256(f"{target}\0{canonical}".encode()).hexdigest()
+
+        cached = self.cache.get(key)
+        if cached:
+            self._latencies["hit"].append(time.perf_counter() - start)
+            return *cached, True
+
+        with self._render_lock:
+            body, content_type = self._render(target, data)
+        self.cache.put(key, body, content_type)
+        self._latencies["miss"].append(time.perf_counter() - start)
+        return body, content_type, False
+
+    def _render(self, target: str, data: dict) -> tuple[bytes, str]:
+        ctx = BuildContext(data=data)
+        if ctx.schema_errors:
+            raise RenderError(HTTPStatus.UNPROCESSABLE_ENTITY, "profile does not match the schema", ctx.schema_errors)
+        if target in TEXT_TARGETS:
+            module, content_type = TEXT_TARGETS[target]
+            return import_module(f"resume_generator.{module}").render(ctx), content_type
+
+        if target not in data.get("variants", {}):
+            known = sorted([*data.get("variants", {}), *TEXT_TARGETS])
+            raise RenderError(HTTPStatus.NOT_FOUND, f"unknown target {target!r} (choose from {', '.join(known)})")
+        return import_module("resume_generator.generate_resume").render(ctx, target), "application/pdf"
+
+    def metrics(self) -> dict:
+        """Cache statistics plus latency percentiles of recent hits and misses."""
+        latency = {}
+        for kind, samples in self._latencies.items():
+            ms = sorted(s * 1000 for s in samples)
+            latency[kind] = {
+                "count": len(ms),
+                "mean_ms": round(statistics.fmean(ms), 3) if ms else None,
+                "p50_ms": round(ms[len(ms) // 2], 3) if ms else None,
+                "p95_ms": round(ms[int(len(ms) * 0.95)], 3) if ms else None,
+                "max_ms": round(ms[-1], 3) if ms else None,
+            }
+        from .shared import layout_cache_stats  # noqa: PLC0415 - reportlab is loaded by the first PDF render anyway
+
+        return {"cache": self.cache.stats(), "layout_cache": layout_cache_stats(), "latency": latency}
+
+
+class RenderHandler(BaseHTTPRequestHandler):
+    renderer: Renderer
+
+    def do_GET(self):
+        """Render from data.json, or report metrics."""
+        if self.path == "/metrics":
+            self._send(HTTPStatus.OK, json.dumps(self.renderer.metrics(), indent=2).encode(), "application/json")
+            return
+        self._render(profile=None)
+
+    def do_POST(self):
+        """Render from the profile JSON in the request body."""
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            self._error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"profile larger than {MAX_BODY_BYTES} bytes")
+            return
+        try:
+            profile = json.loads(self.rfile.read(length))
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            self._error(HTTPStatus.BAD_REQUEST, f"invalid profile JSON: {e}")
+            return
+        if not isinstance(profile, dict):
+            self._error(HTTPStatus.BAD_REQUEST, "profile JSON must be an object")
+            return
+        self._render(profile)
+
+    def _render(self, profile: dict | None):
+        prefix, _, target = self.path.partition("?")[0].rpartition("/")
+        if prefix != "/render" or not target:
+            self._error(HTTPStatus.NOT_FOUND, "use /render/<target> or /metrics")
+            return
+        try:
+            body, content_type, hit = self.renderer.render(target, profile)
+        except RenderError as e:
+            self._error(e.status, str(e), e.errors)
+        except Exception as e:  # noqa: BLE001 - report a broken profile instead of dropping the connection
+            self._error(HTTPStatus.INTERNAL_SERVER_ERROR, f"{type(e).__name__}: {e}")
+        else:
+            self._send(HTTPStatus.OK, body, content_type, cache="hit" if hit else "miss")
+
+    def _error(self, status: HTTPStatus, message: str, errors: list[str] | None = None):
+        body = {"error": message, **({"errors": errors} if errors else {})}
+        self._send(status, json.dumps(body).encode(), "application/json")
+
+    def _send(self, status: HTTPStatus, body: bytes, content_type: str, cache: str | None = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if cache:
+            self.send_header("X-Cache", cache)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def make_server(host: str, port: int, cache_bytes: int) -> ThreadingHTTPServer:
+    handler = type("BoundRenderHandler", (RenderHandler,), {"renderer": Renderer(RenderCache(cache_bytes))})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument(
+        "--cache-mb",
+        type=float,
+        default=DEFAULT_CACHE_MB,
+        help=f"size bound of the render cache in MiB (default: {DEFAULT_CACHE_MB})",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    server = make_server(args.host, args.port, int(args.cache_mb * 1024 * 1024))
+    print(f"Render service on http://{args.host}:{args.port}/render/<target> (metrics: /metrics)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,26 @@
 """Shared styles and utilities for all resume generators."""
 
-import json
+import hashlib
+import weakref
+from collections import OrderedDict
+from collections.abc import Iterable
 from pathlib import Path
+from typing import NamedTuple
 
+from reportlab import rl_config
 from reportlab.lib.colors import HexColor
 from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.lib.units import inch
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.platypus import HRFlowable, Paragraph, SimpleDocTemplate, Spacer
+from reportlab.platypus.paragraph import _FUZZ
+
+from .context import DATA_PATH, PACKAGE_DIR, ROOT_DIR, BuildContext
+from .profiling import span, traced
+from .variants import Variant
 
 # Colors
 PRIMARY = HexColor("#1a1a2e")
@@ -16,15 +28,150 @@ ACCENT = HexColor("#4a90d9")
 TEXT = HexColor("#333333")
 GREY = HexColor("#666666")
 
-DATA_PATH = Path(__file__).parent.parent.parent / "data.json"
+
+class Fonts(NamedTuple):
+    regular: str
+    bold: str
+
+
+# Built-in PDF fonts: never embedded, but limited to Latin-1 plus the Symbol/ZapfDingbats fallbacks
+BASE_FONTS = Fonts("Helvetica", "Helvetica-Bold")
+# Unicode TTF families (regular, bold file names), in order of preference
+FONT_FAMILIES = {
+    "DejaVuSans": ("DejaVuSans.ttf", "DejaVuSans-Bold.ttf"),
+    "NotoSans": ("NotoSans-Regular.ttf", "NotoSans-Bold.ttf"),
+    "LiberationSans": ("LiberationSans-Regular.ttf", "LiberationSans-Bold.ttf"),
+}
+# Searched recursively, in order, for the family's files
+FONT_DIRS = (
+    ROOT_DIR / "fonts",
+    PACKAGE_DIR.parent / "fonts",
+    Path.home() / ".fonts",
+    Path.home() / ".local/share/fonts",
+    Path("/usr/share/fonts"),
+    Path("/usr/local/share/fonts"),
+    Path("/Library/Fonts"),
+)
+# Families registered by this process, so every document reuses the parsed TTFs
+_families: dict[str, Fonts] = {}
 
 
 def load_data() -> dict:
-    with open(DATA_PATH, encoding="utf-8") as f:
-        return json.load(f)
+    return BuildContext(data_path=DATA_PATH).data
+
+
+def find_font_family(family: str) -> tuple[Path, Path] | None:
+    """(regular, bold) TTF files of ``family`` from the first font directory holding both; None if missing."""
+    regular, bold = FONT_FAMILIES[family]
+    for directory in FONT_DIRS:
+        if not directory.is_dir():
+            continue
+        paths = (next(directory.rglob(regular), None), next(directory.rglob(bold), None))
+        if all(paths):
+            return paths
+    return None
+
+
+def register_font_family(family: str) -> Fonts | None:
+    """Register ``family`` with ReportLab once per process; None if its files are not installed.
+
+    Parsing a TTF is the expensive part, and ReportLab's font registry outlives module
+    reloads in watch mode, so an already registered face is never parsed again.
+    Registered faces are embedded as subsets of the glyphs each document uses.
+    """
+    if family in _families:
+        return _families[family]
+    fonts = Fonts(family, f"{family}-Bold")
+    registered = set(pdfmetrics.getRegisteredFontNames())
+    if not registered.issuperset(fonts):
+        paths = find_font_family(family)
+        if paths is None:
+            return None
+        with span(f"register_font.{family}", "fonts"):
+            for name, path in zip(fonts, paths, strict=True):
+                if name not in registered:
+                    pdfmetrics.registerFont(TTFont(name, path))
+    # <b> markup inside paragraphs maps to the family's bold face
+    pdfmetrics.registerFontFamily(
+        family,
+        normal=fonts.regular,
+        bold=fonts.bold,
+        italic=fonts.regular,
+        boldItalic=fonts.bold,
+    )
+    _families[family] = fonts
+    return fonts
 
 
-def build_styles():
+def variant_texts(data: dict, variant: Variant) -> list[str]:
+    """Every data.json text the ``add_*`` sections draw into ``variant``'s PDF; keep in step with them."""
+    personal = data["personal"]
+    texts = [
+        *(personal[key] for key in ("hiring_notice", "name", "location", "email", "github", "linkedin", "telegram")),
+        data["titles"][variant.name],
+        data["summaries"][variant.name],
+    ]
+    for key in variant.skill_keys:
+        if key in data["skills"]:
+            texts.extend((data["skills"][key]["label"], *data["skills"][key]["items"]))
+    for job in variant.jobs:
+        texts.extend((job.title, job.company_line, *job.bullets, *job.tech))
+    if variant.leadership:
+        # The leadership section shows the first narrative only
+        narratives = (job["turnaround_narrative"] for job in data["experience"] if job.get("turnaround_narrative"))
+        texts.append(next(narratives, ""))
+    for edu in data["education"]:
+        texts.extend((edu["title"], edu["institution"], edu["status"]))
+    texts.extend((data["languages"]["russian"], data["languages"]["english"]))
+    return texts
+
+
+def needs_unicode_font(texts: Iterable[str]) -> bool:
+    """Whether ``texts`` hold characters that neither Helvetica nor its fallback fonts can draw."""
+    helvetica = pdfmetrics.getFont(BASE_FONTS.regular)
+    encodings = [font.encName for font in (helvetica, *helvetica.substitutionFonts)]
+    for char in set().union(*texts):
+        if not any(char.encode(encoding, errors="ignore") for encoding in encodings):
+            return True
+    return False
+
+
+def select_fonts(texts: Iterable[str], family: str | None = None) -> Fonts:
+    """Fonts for a PDF drawing ``texts``: ``family`` if given, else Helvetica unless the text needs a Unicode family."""
+    if family == BASE_FONTS.regular:
+        return BASE_FONTS
+    if family is not None:
+        if family not in FONT_FAMILIES:
+            msg = f"unknown font family {family!r} (choose from {', '.join([BASE_FONTS.regular, *FONT_FAMILIES])})"
+            raise ValueError(msg)
+        fonts = register_font_family(family)
+        if fonts is None:
+            msg = f"font family {family!r} not found in {', '.join(str(d) for d in FONT_DIRS)}"
+            raise FileNotFoundError(msg)
+        return fonts
+    if not needs_unicode_font(texts):
+        return BASE_FONTS
+    for candidate in FONT_FAMILIES:
+        fonts = register_font_family(candidate)
+        if fonts:
+            return fonts
+    print(f"⚠ no Unicode font found ({', '.join(FONT_FAMILIES)}); some characters will not render")
+    return BASE_FONTS
+
+
+# Style sheets per font pair, shared by every document this process renders
+_style_sheets: dict[Fonts, object] = {}
+
+
+def styles_for(fonts: Fonts = BASE_FONTS):
+    """Style sheet for ``fonts``, built on first use."""
+    if fonts not in _style_sheets:
+        _style_sheets[fonts] = build_styles(fonts)
+    return _style_sheets[fonts]
+
+
+@traced("build_styles")
+def build_styles(fonts: Fonts = BASE_FONTS):
     styles = getSampleStyleSheet()
 
     styles.add(
@@ -32,7 +179,7 @@ def build_styles():
             name="Notice",
             fontSize=8,
             leading=10,
-            fontName="Helvetica",
+            fontName=fonts.regular,
             textColor=ACCENT,
             alignment=TA_CENTER,
             spaceAfter=6,
@@ -44,7 +191,7 @@ def build_styles():
             fontSize=20,
             leading=24,
             textColor=PRIMARY,
-            fontName="Helvetica-Bold",
+            fontName=fonts.bold,
             spaceAfter=2,
         ),
     )
@@ -54,7 +201,7 @@ def build_styles():
             fontSize=11,
             leading=13,
             textColor=ACCENT,
-            fontName="Helvetica-Bold",
+            fontName=fonts.bold,
             spaceAfter=6,
         ),
     )
@@ -64,7 +211,7 @@ def build_styles():
             fontSize=8.5,
             leading=11,
             textColor=GREY,
-            fontName="Helvetica",
+            fontName=fonts.regular,
             spaceAfter=2,
         ),
     )
@@ -74,7 +221,7 @@ def build_styles():
             fontSize=10.5,
             leading=13,
             textColor=PRIMARY,
-            fontName="Helvetica-Bold",
+            fontName=fonts.bold,
             spaceBefore=10,
             spaceAfter=5,
         ),
@@ -85,7 +232,7 @@ def build_styles():
             fontSize=10,
             leading=12,
             textColor=PRIMARY,
-            fontName="Helvetica-Bold",
+            fontName=fonts.bold,
             spaceBefore=7,
             spaceAfter=1,
         ),
@@ -96,7 +243,7 @@ def build_styles():
             fontSize=9,
             leading=11,
             textColor=ACCENT,
-            fontName="Helvetica",
+            fontName=fonts.regular,
             spaceAfter=3,
         ),
     )
@@ -106,7 +253,7 @@ def build_styles():
             fontSize=9,
             leading=12,
             textColor=TEXT,
-            fontName="Helvetica",
+            fontName=fonts.regular,
             leftIndent=12,
             spaceAfter=1.5,
         ),
@@ -117,7 +264,7 @@ def build_styles():
             fontSize=9,
             leading=12.5,
             textColor=TEXT,
-            fontName="Helvetica",
+            fontName=fonts.regular,
             alignment=TA_JUSTIFY,
             spaceAfter=4,
         ),
@@ -128,30 +275,220 @@ def build_styles():
             fontSize=8.5,
             leading=11,
             textColor=TEXT,
-            fontName="Helvetica",
+            fontName=fonts.regular,
             spaceAfter=1.5,
         ),
     )
     return styles
 
 
-def make_doc(output_path: str) -> SimpleDocTemplate:
-    return SimpleDocTemplate(
+# Bounds of the paragraph layout caches, in entries
+PARSE_CACHE_SIZE = 4096
+WRAP_CACHE_SIZE = 4096
+
+
+class LayoutCache:
+    """LRU mapping bounded by its entry count, with hit/miss counters."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key: tuple):
+        """Cached value, marked most recently used; None on a miss."""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: tuple, value: object):
+        """Store a value, evicting the least recently used entry when full."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry; the counters keep running."""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Entry count and hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+# Parsed markup by (text, style), line breaks by (text, style, width); shared by every
+# variant and document built in this process
+_parsed = LayoutCache(PARSE_CACHE_SIZE)
+_wrapped = LayoutCache(WRAP_CACHE_SIZE)
+_style_keys: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _style_key(style: ParagraphStyle) -> str:
+    """Style name plus a digest of its attributes, so equal styles from different stylesheets share entries."""
+    key = _style_keys.get(style)
+    if key is None:
+        attributes = sorted((name, repr(value)) for name, value in vars(style).items() if name != "parent")
+        key = f"{style.name}:{hashlib.sha1(repr(attributes).encode(), usedforsecurity=False).hexdigest()}"
+        _style_keys[style] = key
+    return key
+
+
+def clear_layout_caches():
+    """Empty the parse and line-break caches, e.g. so a benchmark sample starts cold."""
+    _parsed.clear()
+    _wrapped.clear()
+
+
+def layout_cache_stats() -> dict:
+    """Hit/miss counters of the markup parse and line-break caches."""
+    return {"parse": _parsed.stats(), "wrap": _wrapped.stats()}
+
+
+class CachedParagraph(Paragraph):
+    """Paragraph that reuses parsed markup and line breaks of identical paragraphs.
+
+    Variants repeat most of their text (header, skills, shared bullets), and page
+    fitting lays the same story out many times, so markup is parsed once per
+    (text, style) and broken into lines once per (text, style, width). Paragraphs
+    created by ``split()`` carry fragments instead of text and bypass the caches.
+    """
+
+    def __init__(self, text, style=None, **kwargs: object) -> None:
+        self._layout_key = None
+        if kwargs or style is None:
+            super().__init__(text, style, **kwargs)
+            return
+        self._layout_key = (text, _style_key(style))
+        parsed = _parsed.get(self._layout_key)
+        if parsed is None:
+            super().__init__(text, style)
+            _parsed.put(self._layout_key, (self.text, self.style, self.frags, self.bulletText))
+        else:
+            text, style, frags, bullet = parsed
+            super().__init__(text, style, bulletText=bullet, frags=frags)
+
+    def wrap(self, availWidth, availHeight):  # noqa: N803 - platypus signature
+        """Line breaks for ``availWidth``, computed once per distinct paragraph and width."""
+        if self._layout_key is None or availWidth < _FUZZ:
+            return super().wrap(availWidth, availHeight)
+        key = (*self._layout_key, availWidth)
+        layout = _wrapped.get(key)
+        if layout is None:
+            result = super().wrap(availWidth, availHeight)
+            _wrapped.put(key, (self._wrapWidths, self.blPara, self.height))
+            return result
+        self.width = availWidth
+        wrap_widths, self.blPara, self.height = layout
+        self._wrapWidths = list(wrap_widths)
+        return self.width, self.height
+
+
+class TracedDocTemplate(SimpleDocTemplate):
+    """SimpleDocTemplate whose layout-and-write pass is recorded as a ``pdf.build`` span.
+
+    Streams are Flate-compressed without ReportLab's default ASCII85 layer, which
+    only makes them about a quarter larger.
+    """
+
+    def build(self, flowables, *args: object, **kwargs: object):
+        """Lay out and write the document."""
+        use_a85, rl_config.useA85 = rl_config.useA85, 0
+        try:
+            with span("pdf.build") as event_args:
+                event_args["flowables"] = len(flowables)
+                hits, misses = _wrapped.hits, _wrapped.misses
+                super().build(flowables, *args, **kwargs)
+                event_args["pages"] = self.page
+                event_args["wrap_cache"] = f"{_wrapped.hits - hits} hits, {_wrapped.misses - misses} misses"
+        finally:
+            rl_config.useA85 = use_a85
+
+
+def make_doc(output_path, *, reproducible: bool = True) -> SimpleDocTemplate:
+    """A4 resume document writing to a path or file-like object.
+
+    In reproducible mode the document ID is invariant and the creation date is
+    ``SOURCE_DATE_EPOCH`` when set (ReportLab's fixed 2000-01-01 otherwise), so the
+    same story always yields byte-identical output.
+    """
+    return TracedDocTemplate(
         output_path,
         pagesize=A4,
         rightMargin=0.55 * inch,
         leftMargin=0.55 * inch,
         topMargin=0.45 * inch,
         bottomMargin=0.45 * inch,
+        invariant=1 if reproducible else 0,
+        pageCompression=1,
     )
 
 
+# Frame padding SimpleDocTemplate uses on every side of its single frame
+FRAME_PADDING = 6
+
+
+def measure_pages(story: list, doc: SimpleDocTemplate, heights: dict | None = None) -> int:
+    """Pages ``story`` fills in ``doc``'s frame, found with ``wrap()``/``split()`` alone - nothing is drawn.
+
+    Mirrors platypus' frame filling: space before a flowable is dropped at the top of a
+    frame and overlaps the previous flowable's space after; paragraphs that do not fit
+    are split across pages. ``heights`` caches wrapped heights of the story's own
+    flowables by ``id()`` (they only depend on the frame width), so measuring several
+    subsets of one story wraps each paragraph once.
+    """
+    width = doc.width - 2 * FRAME_PADDING
+    height = doc.height - 2 * FRAME_PADDING
+    heights = {} if heights is None else heights
+    owned = {id(flowable) for flowable in story}
+    pages, y, at_top, space_after = 1, height, True, 0
+    pending = list(story)
+    while pending:
+        flowable = pending.pop(0)
+        space = 0 if at_top else max(flowable.getSpaceBefore() - space_after, 0)
+        room = y - space
+        if room > 0:
+            h = heights.get(id(flowable))
+            if h is None:
+                _, h = flowable.wrap(width, room)
+                if id(flowable) in owned:
+                    heights[id(flowable)] = h
+            if h <= room + 1e-8:
+                space_after = flowable.getSpaceAfter()
+                y -= space + h + space_after
+                at_top = at_top and space + h + space_after == 0
+                continue
+            parts = flowable.split(width, room)
+            if parts:
+                pending[:0] = parts
+                continue
+        if at_top:  # too large for an empty frame; platypus would overflow it as well
+            y = 0
+            continue
+        pending.insert(0, flowable)
+        pages, y, at_top, space_after = pages + 1, height, True, 0
+    return pages
+
+
+@traced("story.header")
 def add_header(story, data, title_key, styles):
     """Add name, title, contact info, and divider."""
     p = data["personal"]
-    story.append(Paragraph(p["hiring_notice"], styles["Notice"]))
-    story.append(Paragraph(p["name"], styles["Name"]))
-    story.append(Paragraph(data["titles"][title_key], styles["TitleHeader"]))
+    story.append(CachedParagraph(p["hiring_notice"], styles["Notice"]))
+    story.append(CachedParagraph(p["name"], styles["Name"]))
+    story.append(CachedParagraph(data["titles"][title_key], styles["TitleHeader"]))
 
     contact_parts = [
         p["location"],
@@ -160,106 +497,88 @@ def add_header(story, data, title_key, styles):
         f"linkedin.com/in/{p['linkedin']}",
         f"t.me/{p['telegram']}",
     ]
-    story.append(Paragraph(" | ".join(contact_parts), styles["Contact"]))
+    story.append(CachedParagraph(" | ".join(contact_parts), styles["Contact"]))
     story.append(Spacer(1, 6))
     story.append(HRFlowable(width="100%", thickness=0.75, color=ACCENT, spaceBefore=0, spaceAfter=6))
 
 
+@traced("story.summary")
 def add_summary(story, data, summary_key, styles):
-    story.append(Paragraph("PROFESSIONAL SUMMARY", styles["SectionHeader"]))
-    story.append(Paragraph(data["summaries"][summary_key], styles["Summary"]))
+    story.append(CachedParagraph("PROFESSIONAL SUMMARY", styles["SectionHeader"]))
+    story.append(CachedParagraph(data["summaries"][summary_key], styles["Summary"]))
 
 
+@traced("story.skills")
 def add_skills(story, data, skill_keys, styles):
-    story.append(Paragraph("TECHNICAL SKILLS", styles["SectionHeader"]))
+    story.append(CachedParagraph("TECHNICAL SKILLS", styles["SectionHeader"]))
     for key in skill_keys:
         if key in data["skills"]:
             s = data["skills"][key]
             story.append(
-                Paragraph(
+                CachedParagraph(
                     f"<b>{s['label']}:</b> {', '.join(s['items'])}",
                     styles["SkillLine"],
                 ),
             )
 
 
-def add_experience(story, data, resume_name, title_variant, styles, max_bullets=None):
-    story.append(Paragraph("PROFESSIONAL EXPERIENCE", styles["SectionHeader"]))
-    is_traditional = "traditional" in resume_name
+@traced("story.experience")
+def add_experience(story, variant, styles, max_bullets=None):
+    """Add the experience section from a compiled variant (see variants.compile_variants).
 
-    for job in data["experience"]:
-        job_title = job.get("titles", {}).get(title_variant, job.get("title", ""))
-        if job_title:
-            story.append(Paragraph(job_title, styles["JobTitle"]))
+    ``max_bullets`` caps the bullets shown per job: one limit for every job, or a list
+    with one limit per job. Bullets keep their data.json order, so the first ones stay.
+    """
+    story.append(CachedParagraph("PROFESSIONAL EXPERIENCE", styles["SectionHeader"]))
 
-        parts = [job["company"]]
-        if is_traditional:
-            product = job.get("product_sanitized", job.get("product", ""))
-        else:
-            product = job.get("product", "")
-
-        if product:
-            parts[0] += f" - {product}"
-        if job.get("period"):
-            parts.append(job["period"])
-        location = job.get("location", "")
-        if is_traditional and job.get("location_sanitized"):
-            location = job["location_sanitized"]
-        if location:
-            parts.append(location)
-        story.append(Paragraph(" | ".join(parts), styles["Company"]))
-
-        bullets = [b for b in job.get("bullets", []) if resume_name in b.get("resumes", [])]
-        if max_bullets:
-            bullets = bullets[:max_bullets]
-
-        for b in bullets:
-            bullet_text = b.get("text", "")
-            if is_traditional:
-                bullet_text = b.get("sanitized", bullet_text)
-            if bullet_text:
-                story.append(Paragraph(f"\u2022 {bullet_text}", styles["BulletItem"]))
-
-        tech_list = job.get("tech")
-        if isinstance(tech_list, dict):
-            if is_traditional:
-                tech_list = tech_list.get("traditional", [])
-            else:
-                tech_list = tech_list.get("crypto", [])
-
-        if tech_list:
+    limits = max_bullets if isinstance(max_bullets, list | tuple) else [max_bullets] * len(variant.jobs)
+    for index, (job, limit) in enumerate(zip(variant.jobs, limits, strict=True)):
+        if job.title:
+            story.append(CachedParagraph(job.title, styles["JobTitle"]))
+        story.append(CachedParagraph(job.company_line, styles["Company"]))
+
+        bullets = job.bullets[:limit] if limit is not None else job.bullets
+        for position, bullet_text in enumerate(bullets):
+            paragraph = CachedParagraph(f"\u2022 {bullet_text}", styles["BulletItem"])
+            paragraph.resume_bullet = (index, position)  # lets page fitting drop bullets without rebuilding
+            story.append(paragraph)
+
+        if job.tech:
             story.append(
-                Paragraph(
-                    f"<b>Tech:</b> {', '.join(tech_list)}",
+                CachedParagraph(
+                    f"<b>Tech:</b> {', '.join(job.tech)}",
                     styles["BulletItem"],
                 ),
             )
 
 
+@traced("story.leadership")
 def add_leadership_section(story, data, styles):
     for job in data["experience"]:
         if job.get("turnaround_narrative"):
-            story.append(Paragraph("LEADERSHIP LESSONS", styles["SectionHeader"]))
-            story.append(Paragraph(job["turnaround_narrative"], styles["Summary"]))
+            story.append(CachedParagraph("LEADERSHIP LESSONS", styles["SectionHeader"]))
+            story.append(CachedParagraph(job["turnaround_narrative"], styles["Summary"]))
             break
 
 
+@traced("story.education")
 def add_education(story, data, styles):
-    story.append(Paragraph("PROFESSIONAL DEVELOPMENT", styles["SectionHeader"]))
+    story.append(CachedParagraph("PROFESSIONAL DEVELOPMENT", styles["SectionHeader"]))
     for edu in data["education"]:
         story.append(
-            Paragraph(
+            CachedParagraph(
                 f"<b>{edu['title']}</b> - {edu['institution']} ({edu['status']})",
                 styles["BulletItem"],
             ),
         )
 
 
+@traced("story.languages")
 def add_languages(story, data, styles):
-    story.append(Paragraph("LANGUAGES", styles["SectionHeader"]))
+    story.append(CachedParagraph("LANGUAGES", styles["SectionHeader"]))
     lang = data["languages"]
     story.append(
-        Paragraph(
+        CachedParagraph(
             f"Russian: {lang['russian']} | English: {lang['english']}",
             styles["BulletItem"],
         ),
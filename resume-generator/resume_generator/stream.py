@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""Render a stream of profiles straight into a zip or tar archive.
+
+Profiles are read one JSON object per line from a JSONL file or stdin, rendered in
+memory (PDFs, README, LinkedIn texts and a self-contained portfolio page) and added
+to the archive under ``<line>_<Name>/``; nothing is written to disk in between, and
+the archive itself may be stdout. Only a bounded window of profiles is in flight at
+any time, so peak memory does not depend on the length of the stream. A profile that
+fails to parse, validate or render is logged (stderr, and ``--errors`` as JSONL) and
+skipped; the stream goes on.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import tarfile
+import time
+import traceback
+import zipfile
+from collections import deque
+from collections.abc import Iterator
+from typing import BinaryIO, NamedTuple
+
+from .context import BuildContext
+
+FORMATS = ("zip", "tar", "tar.gz", "tar.xz")
+DEFAULT_PROGRESS = 100
+# Archive members carry a fixed timestamp, so the same stream yields the same archive
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+MEMBER_MODE = 0o644
+
+
+class Rendered(NamedTuple):
+    line: int
+    name: str
+    members: list[tuple[str, bytes]]
+    error: str
+    seconds: float
+
+
+class Archive:
+    """Write-only zip or tar archive that adds members from memory; works on unseekable streams."""
+
+    def __init__(self, fileobj: BinaryIO, fmt: str) -> None:
+        self.format = fmt
+        self.members = 0
+        self.bytes = 0
+        if fmt == "zip":
+            self._zip = zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_DEFLATED)
+        else:
+            compression = fmt.partition(".")[2]
+            self._tar = tarfile.open(fileobj=fileobj, mode=f"w|{compression}")  # noqa: SIM115 - closed by close()
+
+    def add(self, name: str, data: bytes):
+        """Append one file."""
+        if self.format == "zip":
+            info = zipfile.ZipInfo(name, date_time=ZIP_DATE_TIME)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = MEMBER_MODE << 16
+            self._zip.writestr(info, data)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size, info.mode = len(data), MEMBER_MODE
+            self._tar.addfile(info, io.BytesIO(data))
+        self.members += 1
+        self.bytes += len(data)
+
+    def close(self):
+        """Write the zip central directory or the tar end-of-archive blocks."""
+        (self._zip if self.format == "zip" else self._tar).close()
+
+
+def read_profiles(stream: Iterator[str]) -> Iterator[tuple[int, str]]:
+    """(line number, line) for every non-blank line; lines are parsed by the renderer."""
+    for number, line in enumerate(stream, start=1):
+        if line.strip():
+            yield number, line
+
+
+def profile_members(ctx: BuildContext) -> Iterator[tuple[str, bytes]]:
+    """(archive path, content) of every artifact of one profile, relative to its directory."""
+    from . import generate_linkedin, generate_portfolio, generate_readme, generate_resume  # noqa: PLC0415
+
+    for name, variant in ctx.variants.items():
+        yield f"{ctx.file_prefix}_Resume_{variant.file_suffix}.pdf", generate_resume.render(ctx, name)
+    yield "README.md", generate_readme.render(ctx)
+    yield "linkedin_texts.md", generate_linkedin.render(ctx)
+    yield "portfolio/index.html", generate_portfolio.render(ctx)
+
+
+def render_line(number: int, line: str) -> Rendered:
+    """Parse, validate and render one JSONL line; failures are returned, not raised."""
+    start = time.perf_counter()
+    name = f"line-{number:06d}"
+    try:
+        data = json.loads(line)
+        if not isinstance(data, dict):
+            msg = f"expected a JSON object, got {type(data).__name__}"
+            raise TypeError(msg)  # noqa: TRY301 - reported like every other per-profile failure
+        ctx = BuildContext(data=data)
+        if ctx.schema_errors:
+            return Rendered(number, name, [], "\n".join(ctx.schema_errors), time.perf_counter() - start)
+        name = f"{number:06d}_{ctx.file_prefix}"
+        # Generators report progress on stdout, which may be the archive
+        with contextlib.redirect_stdout(io.StringIO()):
+            members = [(f"{name}/{path}", content) for path, content in profile_members(ctx)]
+    except Exception as e:  # noqa: BLE001 - one bad profile must not stop the stream
+        error = f"{type(e).__name__}: {e}" if isinstance(e, ValueError | TypeError) else traceback.format_exc()
+        return Rendered(number, name, [], error, time.perf_counter() - start)
+    return Rendered(number, name, members, "", time.perf_counter() - start)
+
+
+def render_stream(lines: Iterator[tuple[int, str]], jobs: int) -> Iterator[Rendered]:
+    """Rendered profiles in input order, with at most ``2 * jobs`` in flight."""
+    if jobs == 1:
+        yield from (render_line(number, line) for number, line in lines)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415
+
+    window = deque()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for number, line in lines:
+            window.append(pool.submit(render_line, number, line))
+            if len(window) >= 2 * jobs:
+                yield window.popleft().result()
+        while window:
+            yield window.popleft().result()
+
+
+def peak_rss_mib() -> float | None:
+    """Peak resident set size of this process so far (Linux reports KiB); None where ``resource`` is missing."""
+    try:
+        import resource  # noqa: PLC0415 - Unix only
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _rss() -> str:
+    peak = peak_rss_mib()
+    return "" if peak is None else f", peak RSS {peak:.0f} MiB"
+
+
+def archive_format(path: str, requested: str | None) -> str:
+    if requested:
+        return requested
+    for fmt in sorted(FORMATS, key=len, reverse=True):
+        if path.endswith(f".{fmt}"):
+            return fmt
+    msg = f"cannot tell the archive format from {path!r}; pass --format ({', '.join(FORMATS)})"
+    raise ValueError(msg)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("profiles", help="JSONL file with one profile per line, or - for stdin")
+    parser.add_argument("-o", "--output", required=True, help="archive to write (.zip, .tar, .tar.gz, .tar.xz) or -")
+    parser.add_argument("--format", choices=FORMATS, help="archive format (default: from the --output suffix)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="worker processes (default: 1, in-process)")
+    parser.add_argument("--errors", help="append one JSON record per failed profile to this file")
+    parser.add_argument(
+        "--progress",
+        type=int,
+        default=DEFAULT_PROGRESS,
+        metavar="N",
+        help=f"report progress on stderr every N profiles (default: {DEFAULT_PROGRESS}, 0 = never)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    try:
+        fmt = archive_format(args.output, args.format)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    with contextlib.ExitStack() as stack:
+        if args.profiles == "-":
+            source = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8")
+        else:
+            source = stack.enter_context(open(args.profiles, encoding="utf-8"))
+        target = sys.stdout.buffer if args.output == "-" else stack.enter_context(open(args.output, "wb"))
+        errors = stack.enter_context(open(args.errors, "w", encoding="utf-8")) if args.errors else None
+
+        archive = Archive(target, fmt)
+        start = time.perf_counter()
+        done = failed = 0
+        for result in render_stream(read_profiles(source), max(1, args.jobs)):
+            done += 1
+            if result.error:
+                failed += 1
+                print(f"✗ line {result.line} ({result.name}): {result.error.splitlines()[-1]}", file=sys.stderr)
+                if errors:
+                    record = {"line": result.line, "profile": result.name, "error": result.error}
+                    errors.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    errors.flush()
+            for name, content in result.members:
+                archive.add(name, content)
+            if args.progress and done % args.progress == 0:
+                elapsed = time.perf_counter() - start
+                print(
+                    f"… {done:,} profiles ({failed:,} failed), {done / elapsed:.1f}/s, "
+                    f"{archive.bytes / 1024 / 1024:.1f} MiB added{_rss()}",
+                    file=sys.stderr,
+                )
+        archive.close()
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"{'✗' if failed else '✓'} {done - failed}/{done} profiles → {args.output} "
+        f"({archive.members:,} files, {fmt}) in {elapsed:.2f}s{_rss()}",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
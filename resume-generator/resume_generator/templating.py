@@ -0,0 +1,95 @@
+"""Process-wide Jinja2 environment for the portfolio templates.
+
+Compiled templates are kept in a ``FileSystemBytecodeCache`` under ``CACHE_DIR``, so
+only the first render after a template edit pays for lexing, parsing and code
+generation; every later process (batch workers, ``--jobs`` workers, repeated runs)
+loads the cached bytecode. :func:`precompile` goes one step further and writes the
+templates out as Python modules, keyed by a hash of the template sources; while such
+a directory matches the current sources, templates are imported from it directly.
+"""
+
+import hashlib
+import json
+import shutil
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+from jinja2 import ChoiceLoader, Environment, FileSystemBytecodeCache, FileSystemLoader, ModuleLoader
+
+from .context import CACHE_DIR, TEMPLATES_DIR
+
+JINJA_CACHE_DIR = CACHE_DIR / "jinja"
+
+
+def _tojson(value: object, indent: int | None = None) -> str:
+    return json.dumps(value, indent=indent, ensure_ascii=False)
+
+
+def templates_digest(templates_dir: Path = TEMPLATES_DIR) -> str:
+    """Hash of every template's name and source; changes whenever any template does."""
+    digest = hashlib.sha256()
+    for path in sorted(templates_dir.rglob("*.j2")):
+        digest.update(path.relative_to(templates_dir).as_posix().encode())
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def _compiled_dir(cache_dir: Path, digest: str) -> Path:
+    return cache_dir / "compiled" / digest
+
+
+def _new_environment(templates_dir: Path, cache_dir: Path, precompiled: Path | None = None) -> Environment:
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    loader = FileSystemLoader(str(templates_dir))
+    if precompiled:
+        loader = ChoiceLoader([ModuleLoader(str(precompiled)), loader])
+    env = Environment(
+        loader=loader,
+        autoescape=False,
+        keep_trailing_newline=True,
+        bytecode_cache=FileSystemBytecodeCache(str(cache_dir)),
+    )
+    env.filters["tojson"] = _tojson
+    return env
+
+
+@lru_cache(maxsize=8)
+def _environment(templates_dir: Path, cache_dir: Path, digest: str) -> Environment:
+    compiled = _compiled_dir(cache_dir, digest)
+    return _new_environment(templates_dir, cache_dir, compiled if compiled.is_dir() else None)
+
+
+def environment(templates_dir: Path = TEMPLATES_DIR, cache_dir: Path = JINJA_CACHE_DIR) -> Environment:
+    """Shared environment for ``templates_dir``; a new one is only built when a template changed."""
+    return _environment(Path(templates_dir), Path(cache_dir), templates_digest(templates_dir))
+
+
+def precompile(templates_dir: Path = TEMPLATES_DIR, cache_dir: Path = JINJA_CACHE_DIR) -> Path:
+    """Compile every template into Python modules (once per template digest) and return their directory."""
+    templates_dir, cache_dir = Path(templates_dir), Path(cache_dir)
+    digest = templates_digest(templates_dir)
+    target = _compiled_dir(cache_dir, digest)
+    if target.is_dir():
+        return target
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f"{digest}.", suffix=".tmp", dir=target.parent))
+    _new_environment(templates_dir, cache_dir).compile_templates(
+        str(staging),
+        extensions=["j2"],
+        zip=None,
+        ignore_errors=False,
+    )
+    try:
+        staging.rename(target)
+    except OSError:
+        # Another process published the same digest first
+        shutil.rmtree(staging, ignore_errors=True)
+
+    # Modules compiled from older template sources can never be loaded again
+    for stale in target.parent.iterdir():
+        if stale != target and stale.suffix != ".tmp":
+            shutil.rmtree(stale, ignore_errors=True)
+    return target
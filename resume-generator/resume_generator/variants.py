@@ -0,0 +1,98 @@
+"""Resume variants declared in data.json, compiled once into a per-variant index.
+
+Each entry of ``data["variants"]`` describes one PDF resume: the job-title variant it
+uses, whether it shows the sanitized ("traditional") products, locations, bullets and
+tech lists, and whether it includes the leadership section. Compiling walks every
+bullet once and routes it to the variants listed in its ``resumes``, so rendering a
+variant never rescans the experience section.
+"""
+
+from typing import NamedTuple
+
+
+class JobEntry(NamedTuple):
+    title: str
+    company_line: str
+    bullets: list[str]
+    tech: list[str]
+
+
+class Variant(NamedTuple):
+    name: str
+    file_suffix: str
+    skill_keys: list[str]
+    leadership: bool
+    jobs: list[JobEntry]
+
+
+def _company_line(job: dict, *, traditional: bool) -> str:
+    parts = [job["company"]]
+    if traditional:
+        product = job.get("product_sanitized", job.get("product", ""))
+    else:
+        product = job.get("product", "")
+
+    if product:
+        parts[0] += f" - {product}"
+    if job.get("period"):
+        parts.append(job["period"])
+    location = job.get("location", "")
+    if traditional and job.get("location_sanitized"):
+        location = job["location_sanitized"]
+    if location:
+        parts.append(location)
+    return " | ".join(parts)
+
+
+def _tech_list(job: dict, *, traditional: bool) -> list[str]:
+    tech_list = job.get("tech") or []
+    if isinstance(tech_list, dict):
+        tech_list = tech_list.get("traditional" if traditional else "crypto", [])
+    return list(tech_list)
+
+
+def compile_variants(data: dict) -> dict[str, Variant]:
+    declared = data.get("variants", {})
+    experience = data.get("experience", [])
+
+    # Single pass over all bullets: routed[variant][job index] -> that job's bullets, in order
+    routed = {name: [[] for _ in experience] for name in declared}
+    for index, job in enumerate(experience):
+        for bullet in job.get("bullets", []):
+            for resume in bullet.get("resumes", []):
+                if resume in routed:
+                    routed[resume][index].append(bullet)
+
+    # Company lines and tech lists only depend on the job and the traditional flag
+    per_job = {
+        traditional: [
+            (_company_line(job, traditional=traditional), _tech_list(job, traditional=traditional))
+            for job in experience
+        ]
+        for traditional in {bool(spec.get("traditional")) for spec in declared.values()}
+    }
+
+    variants = {}
+    for name, spec in declared.items():
+        traditional = bool(spec.get("traditional"))
+        title_variant = spec.get("title_variant", name)
+        jobs = []
+        for job, bullets, (company_line, tech) in zip(experience, routed[name], per_job[traditional], strict=True):
+            texts = []
+            for bullet in bullets:
+                text = bullet.get("text", "")
+                if traditional:
+                    text = bullet.get("sanitized", text)
+                if text:
+                    texts.append(text)
+            title = job.get("titles", {}).get(title_variant, job.get("title", ""))
+            jobs.append(JobEntry(title=title, company_line=company_line, bullets=texts, tech=tech))
+
+        variants[name] = Variant(
+            name=name,
+            file_suffix=spec.get("file_suffix", name),
+            skill_keys=data.get("skills_by_resume", {}).get(name, []),
+            leadership=bool(spec.get("leadership")),
+            jobs=jobs,
+        )
+    return variants
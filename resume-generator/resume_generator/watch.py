@@ -0,0 +1,200 @@
+"""Watch mode: stay resident and rebuild only the targets whose inputs changed.
+
+reportlab, jinja2, the style sheets and the Jinja environment are loaded once and
+kept warm between rebuilds; one build context, with the command line's options, is
+reused and only re-reads data.json after each change. Changes are picked up through inotify when the optional
+``watchfiles`` package is installed, otherwise by polling modification times.
+"""
+
+import importlib
+import json
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from functools import partial
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from . import budgets, generate_all
+from .context import DATA_PATH, PACKAGE_DIR, TEMPLATES_DIR, BuildContext
+from .schema import ValidationError
+
+POLL_INTERVAL = 0.5
+
+# Generator modules that can be reloaded in place; shared first, since the others import from it
+RELOADABLE = (
+    "shared",
+    "variants",
+    "generate_resume",
+    "generate_backend_crypto",
+    "generate_backend_traditional",
+    "generate_techlead_crypto",
+    "generate_techlead_traditional",
+    "generate_cto",
+    "generate_readme",
+    "generate_portfolio",
+    "generate_linkedin",
+)
+
+LIVE_RELOAD_SCRIPT = """<script>
+(function () {
+  var seen = null;
+  setInterval(function () {
+    fetch('/__build_id', {cache: 'no-store'}).then(function (r) { return r.text(); }).then(function (id) {
+      if (seen !== null && id !== seen) location.reload();
+      seen = id;
+    }).catch(function () {});
+  }, 1000);
+})();
+</script>
+"""
+
+
+def watched_files() -> list[Path]:
+    return [DATA_PATH, *sorted(TEMPLATES_DIR.rglob("*.j2")), *sorted(PACKAGE_DIR.glob("*.py"))]
+
+
+def _is_watched(path: Path) -> bool:
+    return path == DATA_PATH or path.suffix in {".py", ".j2"}
+
+
+def _snapshot() -> dict[Path, int | None]:
+    snapshot = {}
+    for path in watched_files():
+        try:
+            snapshot[path] = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            snapshot[path] = None
+    return snapshot
+
+
+def _poll_changes(interval: float = POLL_INTERVAL) -> Iterator[set[Path]]:
+    previous = _snapshot()
+    while True:
+        time.sleep(interval)
+        current = _snapshot()
+        changed = {path for path in current.keys() | previous.keys() if current.get(path) != previous.get(path)}
+        previous = current
+        if changed:
+            yield changed
+
+
+def iter_changes() -> Iterator[set[Path]]:
+    """Yield sets of changed input files, blocking between batches."""
+    try:
+        from watchfiles import watch as watch_files  # noqa: PLC0415 - optional dependency
+    except ImportError:
+        print(f"Watching {DATA_PATH.name}, templates and generators (polling every {POLL_INTERVAL}s)")
+        yield from _poll_changes()
+        return
+
+    print(f"Watching {DATA_PATH.name}, templates and generators (inotify)")
+    for changes in watch_files(DATA_PATH, TEMPLATES_DIR, PACKAGE_DIR):
+        changed = {Path(path) for _, path in changes if _is_watched(Path(path))}
+        if changed:
+            yield changed
+
+
+def _reload_modules(changed: set[Path]):
+    """Reload changed generator modules, or all of them when shared.py (and thus the styles) changed."""
+    names = {path.stem for path in changed if path.suffix == ".py"}
+    if not names:
+        return
+
+    stuck = sorted(names - set(RELOADABLE))
+    if stuck:
+        print(f"⚠ {', '.join(stuck)} changed - restart watch mode to pick it up")
+
+    shared_changed = "shared" in names
+    for name in RELOADABLE:
+        if shared_changed or name in names:
+            importlib.reload(importlib.import_module(f"resume_generator.{name}"))
+
+
+class LiveReloadHandler(SimpleHTTPRequestHandler):
+    """Static file handler for the portfolio that injects a reload-on-rebuild script."""
+
+    build_id = 0
+
+    def do_GET(self):
+        """Serve the build id endpoint, index.html with the reload script, or a static file."""
+        if self.path == "/__build_id":
+            self._send(str(LiveReloadHandler.build_id).encode(), "text/plain")
+            return
+        if self.path in {"/", "/index.html"}:
+            index = Path(self.directory) / "index.html"
+            html = index.read_text(encoding="utf-8").replace("</body>", LIVE_RELOAD_SCRIPT + "</body>", 1)
+            self._send(html.encode("utf-8"), "text/html; charset=utf-8")
+            return
+        super().do_GET()
+
+    def _send(self, body: bytes, content_type: str):
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object):  # noqa: A002
+        """Keep the console for build output."""
+
+
+def serve(directory: Path, port: int) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", port), partial(LiveReloadHandler, directory=str(directory)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Serving {directory} on http://127.0.0.1:{port}/ (live reload)")
+    return server
+
+
+def rebuild(ctx: BuildContext, jobs: int = 1, *, force: bool = False):
+    start = time.perf_counter()
+    try:
+        built, failed = generate_all.build(ctx, jobs, force=force, show_fresh=False)
+    except json.JSONDecodeError as e:
+        print(f"✗ {DATA_PATH.name} is not valid JSON: {e}", file=sys.stderr)
+        return
+    except ValidationError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        return
+    elapsed = (time.perf_counter() - start) * 1000
+
+    if built:
+        print(f"Rebuilt {len(built) - len(failed)} of {len(built)} affected targets in {elapsed:.0f} ms")
+    else:
+        print(f"· nothing to rebuild ({elapsed:.0f} ms)")
+    # Also after a budgets-only edit, which rebuilds nothing; only what needs attention is printed
+    _, unmatched, exceeded = generate_all.check_budgets(ctx)
+    if exceeded or unmatched:
+        print(budgets.format_report(exceeded, unmatched, ctx.root_dir))
+    if built and not failed:
+        LiveReloadHandler.build_id += 1
+
+
+def watch(ctx: BuildContext, jobs: int = 1, *, force: bool = False, serve_port: int | None = None) -> int:
+    """Build ``ctx`` (with its options), then rebuild the affected targets after every change until interrupted."""
+    for name in RELOADABLE:
+        importlib.import_module(f"resume_generator.{name}")
+    # Pay for the heavy imports and the style/font/template setup once, up front; style
+    # sheets, registered fonts and the Jinja environment are process-wide and only rebuilt
+    # when shared.py or a template changes
+    for variant in ctx.variants:
+        ctx.styles(variant)
+    ctx.jinja_env  # noqa: B018
+
+    server = serve(ctx.portfolio_dir, serve_port) if serve_port else None
+    rebuild(ctx, jobs, force=force)
+    try:
+        for changed in iter_changes():
+            print(f"\n↻ {', '.join(sorted(path.name for path in changed))}")
+            _reload_modules(changed)
+            ctx.reload(templates=any(path.suffix == ".j2" for path in changed))
+            rebuild(ctx, jobs)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    finally:
+        if server:
+            server.shutdown()
+    return 0